@@ -0,0 +1,102 @@
+"""Benchmark IVF and two-stage recall@10 and latency against exact search.
+
+Usage:
+    PYTHONPATH=. uv run python benchmarks/ann_recall.py [--sizes 10000 100000]
+
+Synthetic embeddings are drawn around random topic centres, which mimics the
+clustered structure of real document embeddings. Unlike text-embedding-3
+vectors they spread information evenly over all dimensions, so two-stage
+recall here is a pessimistic estimate.
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from services.ann_index import IVFIndex
+from services.scoring import CompactMatrix, ScoringEngine, normalize_rows
+
+DIMENSION = 1536
+TOPICS = 200
+K = 10
+
+
+def clustered_matrix(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Unit-length rows scattered around random topic centres."""
+    centres = rng.standard_normal((TOPICS, DIMENSION), dtype=np.float32)
+    topics = rng.integers(0, TOPICS, size)
+    noise = rng.standard_normal((size, DIMENSION), dtype=np.float32)
+    return normalize_rows(centres[topics] + 1.0 * noise)
+
+
+def main(
+    sizes: List[int], queries: int, nprobes: List[int], rerank_candidates: List[int]
+):
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        matrix = clustered_matrix(size, rng)
+        engine = ScoringEngine(matrix, normalized=True)
+        # Queries are perturbed copies of indexed rows (noise as large as the row)
+        picks = rng.integers(0, size, queries)
+        noise = rng.standard_normal((queries, DIMENSION), dtype=np.float32)
+        query_matrix = normalize_rows(matrix[picks] + normalize_rows(noise))
+
+        start = time.perf_counter()
+        ivf = IVFIndex.build(matrix)
+        build_seconds = time.perf_counter() - start
+        print(
+            f"\n{size} chunks, {ivf.n_lists} lists, built in {build_seconds:.2f}s"
+        )
+        print(f"{'mode':>10} {'recall@10':>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+        exact_results = []
+        latencies = []
+        for query in query_matrix:
+            start = time.perf_counter()
+            row_ids, _ = engine.top_k(query, K)
+            latencies.append((time.perf_counter() - start) * 1000)
+            exact_results.append(set(row_ids.tolist()))
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{'exact':>10} {1.0:>10.3f} {p50:>9.3f} {p99:>9.3f}")
+
+        for nprobe in nprobes:
+            latencies = []
+            hits = 0
+            for query, expected in zip(query_matrix, exact_results):
+                start = time.perf_counter()
+                candidates = ivf.candidates(query, nprobe)
+                row_ids, _ = engine.top_k(query, K, candidates)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & set(row_ids.tolist()))
+            p50, p99 = np.percentile(latencies, [50, 99])
+            recall = hits / (K * queries)
+            print(f"{f'nprobe={nprobe}':>10} {recall:>10.3f} {p50:>9.3f} {p99:>9.3f}")
+
+        compact = CompactMatrix.build(matrix)
+        for n_candidates in rerank_candidates:
+            latencies = []
+            hits = 0
+            for query, expected in zip(query_matrix, exact_results):
+                start = time.perf_counter()
+                [candidates] = compact.candidates(query[np.newaxis, :], n_candidates)
+                row_ids, _ = engine.top_k(query, K, candidates)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & set(row_ids.tolist()))
+            p50, p99 = np.percentile(latencies, [50, 99])
+            recall = hits / (K * queries)
+            label = f"2stage@{n_candidates}"
+            print(f"{label:>10} {recall:>10.3f} {p50:>9.3f} {p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument(
+        "--rerank-candidates", type=int, nargs="+", default=[50, 200, 1000]
+    )
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.nprobes, args.rerank_candidates)
@@ -0,0 +1,151 @@
+"""Benchmark VectorSearch.search latency on synthetic indexes.
+
+Usage:
+    PYTHONPATH=. uv run python benchmarks/search_latency.py [--sizes 1000 10000 100000]
+
+The query embedding call is replaced with precomputed random vectors, so the
+numbers measure scoring, top-k selection and result formatting only. Pass
+--embedding-latency-ms to simulate the embeddings API round trip; it is paid
+once per search() call and once per search_many() batch.
+
+The response cache is disabled except for the "cached" row, which repeats
+one search against a warm cache.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.embedding_providers import LocalEmbeddingProvider
+from services.index_snapshot import IndexSnapshot
+from services.scoring import normalize_rows
+from services.vector_search import VectorSearch
+
+DIMENSION = 1536
+CATEGORIES = ["concepts", "guides", "tools", "examples", "enterprise"]
+
+
+def make_index(size: int, rng: np.random.Generator) -> VectorSearch:
+    """Create a VectorSearch holding ``size`` random chunks."""
+    df = pd.DataFrame(
+        {
+            "path": [f"{CATEGORIES[i % 5]}/doc_{i // 8}.mdx" for i in range(size)],
+            "title": [f"Document {i // 8}" for i in range(size)],
+            "category": [CATEGORIES[i % 5] for i in range(size)],
+            "content": ["lorem ipsum dolor sit amet " * 60] * size,
+            "chunk_type": ["content"] * size,
+            "section_hierarchy": ["Section"] * size,
+            "heading_level": [2] * size,
+            "word_count": [300] * size,
+            "has_code_blocks": [i % 3 == 0 for i in range(size)],
+            "has_special_components": [False] * size,
+        }
+    )
+    matrix = normalize_rows(rng.standard_normal((size, DIMENSION), dtype=np.float32))
+
+    search = VectorSearch(
+        data_dir=os.path.join("/tmp", "vector_search_benchmark"),
+        embedding_provider=LocalEmbeddingProvider(DIMENSION),
+        response_cache_size=0,
+    )
+    search._snapshot = IndexSnapshot.create(df, matrix, normalized=True)
+    return search
+
+
+def stub_embeddings(search: VectorSearch, queries: np.ndarray, latency_ms: float):
+    """Serve query vectors from ``queries`` instead of calling the API."""
+    query_iter = iter(queries)
+
+    async def fake_embeddings(texts: List[str], model=None) -> List[np.ndarray]:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return [next(query_iter) for _ in texts]
+
+    search.get_embeddings = fake_embeddings
+
+
+async def measure(
+    search: VectorSearch, queries: np.ndarray, latency_ms: float, **kwargs
+) -> List[float]:
+    """Run one search per query and return latencies in milliseconds."""
+    stub_embeddings(search, queries, latency_ms)
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(len(queries)):
+            start = time.perf_counter()
+            await search.search("benchmark query", **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def measure_batch(
+    search: VectorSearch, queries: np.ndarray, batch_size: int, latency_ms: float
+) -> Tuple[float, float]:
+    """Time ``batch_size`` sequential searches against one search_many call."""
+    batch = queries[:batch_size]
+    names = [f"benchmark query {i}" for i in range(batch_size)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        stub_embeddings(search, batch, latency_ms)
+        start = time.perf_counter()
+        for name in names:
+            await search.search(name)
+        sequential = time.perf_counter() - start
+
+        stub_embeddings(search, batch, latency_ms)
+        start = time.perf_counter()
+        await search.search_many(names)
+        batched = time.perf_counter() - start
+    return sequential * 1000, batched * 1000
+
+
+async def main(sizes: List[int], iterations: int, batch_size: int, latency_ms: float):
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>8} {'filter':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    batch_timings = []
+    for size in sizes:
+        search = make_index(size, rng)
+        queries = rng.standard_normal(
+            (iterations * 2 + batch_size, DIMENSION), dtype=np.float32
+        )
+
+        for label, kwargs in (("none", {}), ("category", {"category": "concepts"})):
+            latencies = await measure(
+                search, queries[:iterations], latency_ms, **kwargs
+            )
+            queries = queries[iterations:]
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{size:>8} {label:>10} {p50:>9.3f} {p99:>9.3f}")
+
+        search.response_cache.max_entries = 512
+        latencies = await measure(search, queries[:iterations], latency_ms)
+        search.response_cache.max_entries = 0
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{size:>8} {'cached':>10} {p50:>9.3f} {p99:>9.3f}")
+
+        batch_timings.append(
+            (size, *await measure_batch(search, queries, batch_size, latency_ms))
+        )
+
+    print(f"\n{batch_size} queries: sequential search() vs one search_many()")
+    print(f"{'chunks':>8} {'sequential ms':>14} {'batch ms':>9} {'speedup':>8}")
+    for size, sequential, batched in batch_timings:
+        print(f"{size:>8} {sequential:>14.2f} {batched:>9.2f} {sequential / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.sizes, args.iterations, args.batch_size, args.embedding_latency_ms)
+    )
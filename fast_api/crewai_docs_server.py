@@ -1,4 +1,4 @@
-"""CrewAI Documentation MCP Server - Clean implementation with Whoosh search."""
+"""CrewAI Documentation MCP Server - Clean implementation with semantic and BM25 search."""
 
 import asyncio
 import os
@@ -12,14 +12,24 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from mcp.server.fastmcp import FastMCP
 
 from services.concept_discovery import ConceptDiscoveryService
-from services.github_client import DOCS_PATH, GitHubDocsClient
+from services.docs_source import DOCS_PATH
+from services.github_client import GitHubDocsClient
+from services.local_docs_source import LocalDocsSource
 from services.vector_search import VectorSearch
 from utils.doc_parser import extract_code_blocks, extract_sections
 
-# Initialize services
-github_client = GitHubDocsClient()
-search_service = VectorSearch()
-concept_service = ConceptDiscoveryService(github_client)
+# Initialize services (sharing one docs source). With CREWAI_DOCS_DIR set to a
+# checkout of the crewAI repo, docs are read from disk and checked for changes
+# every few seconds; otherwise they come from GitHub over one connection pool
+# and the docs tree SHA is checked every few minutes.
+CREWAI_DOCS_DIR = os.environ.get("CREWAI_DOCS_DIR")
+if CREWAI_DOCS_DIR:
+    docs_source = LocalDocsSource(CREWAI_DOCS_DIR)
+    search_service = VectorSearch(docs_source=docs_source, poll_interval=5.0)
+else:
+    docs_source = GitHubDocsClient()
+    search_service = VectorSearch(docs_source=docs_source)
+concept_service = ConceptDiscoveryService(docs_source)
 
 # Create MCP server
 mcp = FastMCP("crewai-docs", stateless_http=True, port=10001)
@@ -41,7 +51,15 @@ async def get_search_status() -> Dict[str, Any]:
 
 @mcp.tool()
 async def search_crewai_docs(
-    query: str, category: Optional[str] = None, limit: int = 10
+    query: str,
+    category: Optional[str] = None,
+    limit: int = 10,
+    chunk_type: Optional[str] = None,
+    has_code_blocks: Optional[bool] = None,
+    heading_level: Optional[int] = None,
+    path_prefix: Optional[str] = None,
+    match: str = "all",
+    mode: str = "auto",
 ) -> Dict[str, Any]:
     """
     Search CrewAI documentation using AI-powered semantic search with OpenAI embeddings.
@@ -50,6 +68,13 @@ async def search_crewai_docs(
         query: Natural language search query (e.g., "How do I create an agent?", "workflow automation")
         category: Optional category filter (e.g., "concepts", "guides", "examples")
         limit: Maximum number of results to return (default: 10)
+        chunk_type: Optional chunk type filter (e.g., "code_example", "tutorial", "installation")
+        has_code_blocks: Optional filter for chunks with (True) or without (False) code
+        heading_level: Optional heading level filter (0 for intro, 1 for H1, 2 for H2, ...)
+        path_prefix: Optional documentation path prefix (e.g., "concepts/", "guides/flows")
+        match: Combine filters with "all" (AND, default) or "any" (OR)
+        mode: "semantic", "lexical" (keyword/identifier match), "hybrid" (both), or
+            "auto" (default: lexical for identifiers like "allow_delegation", else hybrid)
 
     Returns:
         Dictionary with semantically relevant search results and metadata
@@ -58,7 +83,69 @@ async def search_crewai_docs(
     if not search_service._ready:
         await search_service.initialize()
 
-    return await search_service.search(query, category, limit)
+    return await search_service.search(
+        query,
+        category,
+        limit,
+        chunk_type=chunk_type,
+        has_code_blocks=has_code_blocks,
+        heading_level=heading_level,
+        path_prefix=path_prefix,
+        match=match,
+        mode=mode,
+    )
+
+
+@mcp.tool()
+async def search_crewai_docs_batch(
+    queries: List[str],
+    category: Optional[str] = None,
+    limit: int = 5,
+    chunk_type: Optional[str] = None,
+    has_code_blocks: Optional[bool] = None,
+    heading_level: Optional[int] = None,
+    path_prefix: Optional[str] = None,
+    match: str = "all",
+    mode: str = "auto",
+    deduplicate: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run several CrewAI documentation searches in one call.
+
+    Prefer this over repeated search_crewai_docs calls when you have multiple related
+    questions: all queries are embedded together and scored in a single pass.
+
+    Args:
+        queries: Natural language or identifier queries (e.g., ["create an agent", "allow_delegation"])
+        category: Optional category filter applied to every query
+        limit: Maximum number of results per query (default: 5)
+        chunk_type: Optional chunk type filter (e.g., "code_example", "tutorial", "installation")
+        has_code_blocks: Optional filter for chunks with (True) or without (False) code
+        heading_level: Optional heading level filter (0 for intro, 1 for H1, 2 for H2, ...)
+        path_prefix: Optional documentation path prefix (e.g., "concepts/", "guides/flows")
+        match: Combine filters with "all" (AND, default) or "any" (OR)
+        mode: "semantic", "lexical", "hybrid", or "auto" (default), as in search_crewai_docs
+        deduplicate: Skip chunks already returned for an earlier query
+
+    Returns:
+        Dictionary with one result list per query, in query order
+    """
+    # Ensure search service is initialized
+    if not search_service._ready:
+        await search_service.initialize()
+
+    return await search_service.search_many(
+        queries,
+        category,
+        limit,
+        chunk_type=chunk_type,
+        has_code_blocks=has_code_blocks,
+        heading_level=heading_level,
+        path_prefix=path_prefix,
+        match=match,
+        mode=mode,
+        deduplicate=deduplicate,
+    )
 
 
 @mcp.tool()
@@ -91,7 +178,7 @@ async def get_concept_docs(concept: str) -> Dict[str, Any]:
 
     # Fetch the actual content
     try:
-        content = await github_client.fetch_file_content(concept_info["full_path"])
+        content = await docs_source.fetch_file_content(concept_info["full_path"])
         if not content:
             return {"error": f"Could not fetch content for concept: {concept}"}
 
@@ -119,9 +206,9 @@ async def get_code_examples(feature: str, limit: int = 10) -> Dict[str, Any]:
     Returns:
         Dictionary with code examples and source information
     """
-    # Search for the feature
-    search_results = search_service.search(
-        feature, limit=limit * 2
+    # Search only chunks that contain code
+    search_results = await search_service.search(
+        feature, limit=limit * 2, has_code_blocks=True
     )  # Get more to filter
 
     if search_results["status"] != "ready":
@@ -137,7 +224,7 @@ async def get_code_examples(feature: str, limit: int = 10) -> Dict[str, Any]:
     for result in search_results["results"]:
         try:
             # Get full content for code extraction
-            full_content = await github_client.fetch_file_content(
+            full_content = await docs_source.fetch_file_content(
                 f"{DOCS_PATH}/{result['path']}"
             )
             if full_content:
@@ -184,7 +271,7 @@ async def get_doc_file(file_path: str) -> Dict[str, Any]:
     """
     try:
         full_path = f"{DOCS_PATH}/{file_path}"
-        content = await github_client.fetch_file_content(full_path)
+        content = await docs_source.fetch_file_content(full_path)
 
         if not content:
             return {"error": f"Could not fetch documentation file: {file_path}"}
@@ -201,12 +288,15 @@ async def get_doc_file(file_path: str) -> Dict[str, Any]:
 
 
 @mcp.tool()
-async def refresh_search_index() -> Dict[str, Any]:
+async def refresh_search_index(full_rebuild: bool = False) -> Dict[str, Any]:
     """
     Force refresh of the vector search index to get latest documentation.
 
-    Note: This will re-embed all documents using OpenAI's API, which may take a few minutes.
-    The index normally refreshes automatically once per day.
+    Note: Only documents whose content changed since the last build are re-embedded
+    using OpenAI's API. The index normally refreshes automatically when the docs change upstream.
+
+    Args:
+        full_rebuild: Re-embed every document instead of only the changed ones
 
     Returns:
         Status of the refresh operation
@@ -216,11 +306,12 @@ async def refresh_search_index() -> Dict[str, Any]:
         concept_service.clear_cache()
 
         # Start background indexing
-        await search_service.start_background_indexing()
+        await search_service.start_background_indexing(full=full_rebuild)
 
         return {
             "status": "started",
             "message": "Vector index refresh started in background. This may take a few minutes.",
+            "full_rebuild": full_rebuild,
             "embedding_model": search_service.model,
         }
 
@@ -247,18 +338,20 @@ async def initialize_services():
 
 # Run the server standalone
 if __name__ == "__main__":
-    # Start initialization in background using asyncio
-    def start_background_init():
-        """Start background initialization."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(initialize_services())
-        loop.close()
 
-    # Start initialization in a separate thread to not block server startup
-    import threading
+    async def serve():
+        """
+        Serve while initializing on the same event loop.
 
-    init_thread = threading.Thread(target=start_background_init, daemon=True)
-    init_thread.start()
+        The revision poller and background rebuilds started during
+        initialization live on this loop, so they keep running while the
+        server does.
+        """
+        init_task = asyncio.create_task(initialize_services())
+        try:
+            await mcp.run_streamable_http_async()
+        finally:
+            init_task.cancel()
+            await docs_source.close()
 
-    mcp.run(transport="streamable-http")
+    asyncio.run(serve())
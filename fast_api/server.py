@@ -1,6 +1,7 @@
 import contextlib
 import os
 
+from crewai_docs_server import docs_source
 from crewai_docs_server import mcp as crewai_docs
 from fastapi import FastAPI
 
@@ -11,6 +12,8 @@ from fastapi import FastAPI
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
     async with contextlib.AsyncExitStack() as stack:
+        # Shared docs source (GitHub connection pool), closed after the MCP sessions
+        await stack.enter_async_context(docs_source)
         # await stack.enter_async_context(tavily_search.session_manager.run())
         await stack.enter_async_context(crewai_docs.session_manager.run())
         yield
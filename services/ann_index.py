@@ -0,0 +1,146 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index in pure NumPy.
+
+Rows are clustered with spherical k-means; each cluster keeps the ids of its
+rows (an inverted list). A query scores the centroids, then only the rows in
+the ``nprobe`` closest lists. Higher ``nprobe`` trades latency for recall.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .scoring import normalize_rows
+
+# Rows scored per block when assigning rows to centroids
+ASSIGN_BLOCK_SIZE = 8192
+
+# Training sample size per list
+TRAINING_POINTS_PER_LIST = 64
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Return the index of the closest centroid for every row."""
+    assignments = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], ASSIGN_BLOCK_SIZE):
+        block = np.asarray(matrix[start : start + ASSIGN_BLOCK_SIZE])
+        assignments[start : start + len(block)] = np.argmax(
+            block @ centroids.T, axis=1
+        )
+    return assignments
+
+
+def _spherical_kmeans(
+    sample: np.ndarray, n_lists: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Cluster unit-length rows by cosine similarity."""
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=n_lists)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        non_empty = counts > 0
+        sums = np.add.reduceat(sample[order], starts[non_empty], axis=0)
+        centroids[non_empty] = normalize_rows(sums)
+
+        # Reseed empty lists with random rows
+        empty = np.flatnonzero(~non_empty)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), len(empty))]
+    return centroids
+
+
+class IVFIndex:
+    """Inverted lists over the rows of an embedding matrix."""
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, rows: np.ndarray):
+        """
+        Args:
+            centroids: Unit-length list centroids, shape (n_lists, dimension)
+            offsets: List boundaries into ``rows``, shape (n_lists + 1,)
+            rows: Row ids grouped by list
+        """
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        n_lists: Optional[int] = None,
+        iterations: int = 10,
+        centroids: Optional[np.ndarray] = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Cluster a unit-length matrix and build the inverted lists.
+
+        Args:
+            matrix: Unit-length rows, shape (chunks, dimension)
+            n_lists: Number of lists; defaults to sqrt(chunks)
+            iterations: k-means iterations
+            centroids: Reuse existing centroids instead of training new ones
+            seed: Random seed for sampling and initialization
+        """
+        if centroids is None:
+            rng = np.random.default_rng(seed)
+            n_lists = n_lists or max(1, int(np.sqrt(matrix.shape[0])))
+            n_lists = min(n_lists, matrix.shape[0])
+            sample_size = min(matrix.shape[0], n_lists * TRAINING_POINTS_PER_LIST)
+            sample_ids = np.sort(
+                rng.choice(matrix.shape[0], sample_size, replace=False)
+            )
+            sample = np.asarray(matrix[sample_ids], dtype=np.float32)
+            centroids = _spherical_kmeans(sample, n_lists, iterations, rng)
+
+        assignments = _assign(matrix, centroids)
+        rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=centroids.shape[0])
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return cls(centroids.astype(np.float32), offsets, rows)
+
+    def candidates(
+        self, query: np.ndarray, nprobe: int, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Collect the row ids of the ``nprobe`` lists closest to ``query``.
+
+        Args:
+            query: Unit-length query vector
+            nprobe: Number of lists to scan
+            mask: Optional boolean row mask; rows outside it are dropped
+
+        Returns:
+            Sorted candidate row ids
+        """
+        nprobe = max(1, min(nprobe, self.n_lists))
+        centroid_scores = self.centroids @ query
+        if nprobe < self.n_lists:
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(self.n_lists)
+
+        rows = np.concatenate(
+            [self.rows[self.offsets[i] : self.offsets[i + 1]] for i in probe]
+        )
+        if mask is not None:
+            rows = rows[mask[rows]]
+        rows.sort()
+        return rows
+
+    def expected_candidates(self, nprobe: int) -> int:
+        """Average number of rows a query with this ``nprobe`` scores."""
+        return int(len(self.rows) * min(nprobe, self.n_lists) / self.n_lists)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"centroids": self.centroids, "offsets": self.offsets, "rows": self.rows}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "IVFIndex":
+        return cls(arrays["centroids"], arrays["offsets"], arrays["rows"])
@@ -0,0 +1,221 @@
+"""In-process BM25 inverted index over document chunks."""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_IDENTIFIER = re.compile(
+    r"^@?[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*(\(\))?$"
+)
+_IDENTIFIER_HINT = re.compile(r"[_@.(]|[a-z][A-Z]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms.
+
+    Identifiers are kept whole and also split into their snake_case and
+    camelCase parts, so ``allow_delegation`` matches both the exact
+    identifier and the words "allow" and "delegation".
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append(word.lower())
+        parts = [
+            part.lower()
+            for piece in word.split("_")
+            for part in _CAMEL_PART.findall(piece)
+        ]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def is_identifier_query(query: str) -> bool:
+    """
+    Check whether a query looks like code identifiers rather than prose.
+
+    Examples: ``allow_delegation``, ``@CrewBase``, ``crew.kickoff_async()``.
+    """
+    words = [word.strip("`") for word in query.split()]
+    if not words or len(words) > 3:
+        return False
+    if not all(_IDENTIFIER.match(word) for word in words):
+        return False
+    return any(_IDENTIFIER_HINT.search(word) for word in words)
+
+
+class BM25Index:
+    """Okapi BM25 scoring with postings stored as flat NumPy arrays."""
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """
+        Args:
+            terms: Vocabulary; a term's position is its id
+            offsets: Posting list boundaries per term id, shape (terms + 1,)
+            doc_ids: Row ids of all postings, grouped by term
+            term_freqs: Term frequency of each posting
+            doc_lengths: Token count per row
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+
+        self.vocabulary: Dict[str, int] = {
+            term: term_id for term_id, term in enumerate(terms.tolist())
+        }
+        doc_count = len(doc_lengths)
+        doc_freqs = np.diff(offsets)
+        self.idf = np.log1p((doc_count - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        avg_length = doc_lengths.mean() if doc_count else 1.0
+        self.length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1.0))
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """Tokenize texts and build the postings."""
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        term_freqs: List[int] = []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, count in counts.items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(doc_id)
+                term_freqs.append(count)
+
+        term_id_array = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_id_array, kind="stable")
+        counts_per_term = np.bincount(term_id_array, minlength=len(vocabulary))
+        offsets = np.concatenate(([0], np.cumsum(counts_per_term))).astype(np.int64)
+
+        return cls(
+            terms=np.asarray(list(vocabulary), dtype=str),
+            offsets=offsets,
+            doc_ids=np.asarray(doc_ids, dtype=np.int32)[order],
+            term_freqs=np.asarray(term_freqs, dtype=np.float32)[order],
+            doc_lengths=doc_lengths,
+            k1=k1,
+            b=b,
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every row for the query; zero where no term matches."""
+        term_ids = {
+            self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary
+        }
+        if not term_ids:
+            return np.zeros(len(self), dtype=np.float32)
+
+        docs, contributions = [], []
+        for term_id in term_ids:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            posting_docs = self.doc_ids[start:end]
+            tf = self.term_freqs[start:end]
+            docs.append(posting_docs)
+            contributions.append(
+                self.idf[term_id]
+                * tf
+                * (self.k1 + 1)
+                / (tf + self.length_norm[posting_docs])
+            )
+
+        return np.bincount(
+            np.concatenate(docs),
+            weights=np.concatenate(contributions),
+            minlength=len(self),
+        ).astype(np.float32)
+
+    def top_k(
+        self, query: str, k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the ``k`` best matching rows that contain at least one query term.
+
+        Returns:
+            Tuple of (row ids, BM25 scores), best match first
+        """
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores > 0)
+        if rows is not None:
+            matched = np.intersect1d(matched, rows, assume_unique=True)
+
+        k = min(k, len(matched))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        matched_scores = scores[matched]
+        if k < len(matched):
+            top = np.argpartition(-matched_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(matched))
+        top = top[np.argsort(-matched_scores[top], kind="stable")]
+        return matched[top], matched_scores[top]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "terms": self.terms,
+            "offsets": self.offsets,
+            "doc_ids": self.doc_ids,
+            "term_freqs": self.term_freqs,
+            "doc_lengths": self.doc_lengths,
+            "params": np.array([self.k1, self.b]),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "BM25Index":
+        k1, b = arrays["params"].tolist()
+        return cls(
+            arrays["terms"],
+            arrays["offsets"],
+            arrays["doc_ids"],
+            arrays["term_freqs"],
+            arrays["doc_lengths"],
+            k1=k1,
+            b=b,
+        )
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[np.ndarray], k: int = 60
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse several best-first row id rankings with reciprocal-rank fusion.
+
+    Returns:
+        Tuple of (row ids, fused scores), best match first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row_id in enumerate(ranking.tolist()):
+            fused[row_id] = fused.get(row_id, 0.0) + 1.0 / (k + rank + 1)
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    row_ids = np.array([row_id for row_id, _ in ordered], dtype=np.int64)
+    scores = np.array([score for _, score in ordered], dtype=np.float32)
+    return row_ids, scores
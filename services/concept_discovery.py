@@ -1,16 +1,40 @@
 """Dynamic concept discovery service for CrewAI documentation."""
 
-from typing import Dict, List
+import itertools
+from datetime import timedelta
+from typing import Dict, List, Optional
 
-from .github_client import DOCS_PATH, GitHubDocsClient
+from .docs_source import DOCS_PATH, DocsSource
+from .github_client import CACHE_TTL, cache as shared_cache
+from .memory_cache import MemoryCache
+
+CONCEPTS_NAMESPACE = "concepts"
+
+# Keys services apart in a shared cache; unlike id(), never reused
+_service_ids = itertools.count()
 
 
 class ConceptDiscoveryService:
     """Service for automatically discovering available CrewAI concepts."""
 
-    def __init__(self, github_client: GitHubDocsClient):
-        self.github_client = github_client
-        self._cached_concepts = None
+    def __init__(
+        self,
+        docs_source: DocsSource,
+        cache: Optional[MemoryCache] = None,
+        cache_ttl: timedelta = CACHE_TTL,
+    ):
+        """
+        Args:
+            docs_source: Source used to list the concept files
+            cache: Cache for the concept map; defaults to the one shared with
+                the GitHub clients, so it is accounted with their listings.
+                Each service keeps its own entry there.
+            cache_ttl: Age after which concepts are discovered again
+        """
+        self.docs_source = docs_source
+        self.cache = cache if cache is not None else shared_cache
+        self.cache_ttl = cache_ttl
+        self._cache_key = f"map:{next(_service_ids)}"
 
     async def discover_concepts(self) -> Dict[str, str]:
         """
@@ -20,11 +44,12 @@ class ConceptDiscoveryService:
             Dictionary mapping concept names to their relative file paths
         """
         # Return cached result if available
-        if self._cached_concepts is not None:
-            return self._cached_concepts
+        cached_concepts = self.cache.get(CONCEPTS_NAMESPACE, self._cache_key)
+        if cached_concepts is not None:
+            return cached_concepts
 
         try:
-            concept_files = await self.github_client.list_docs_files("concepts")
+            concept_files = await self.docs_source.list_docs_files("concepts")
             concept_map = {}
 
             for file in concept_files:
@@ -35,7 +60,7 @@ class ConceptDiscoveryService:
                     concept_map[concept_name] = relative_path
 
             # Cache the result
-            self._cached_concepts = concept_map
+            self._cache_concepts(concept_map)
             return concept_map
 
         except Exception as e:
@@ -48,7 +73,7 @@ class ConceptDiscoveryService:
                 "tools": "concepts/tools.mdx",
                 "memory": "concepts/memory.mdx",
             }
-            self._cached_concepts = fallback
+            self._cache_concepts(fallback)
             return fallback
 
     async def get_concept_info(self, concept_name: str) -> Dict[str, any]:
@@ -133,6 +158,17 @@ class ConceptDiscoveryService:
             "concept_files": concept_map,
         }
 
+    def _cache_concepts(self, concept_map: Dict[str, str]):
+        """Cache the concept map until the listings it came from are revalidated."""
+        size = sum(len(name) + len(path) for name, path in concept_map.items())
+        self.cache.put(
+            CONCEPTS_NAMESPACE,
+            self._cache_key,
+            concept_map,
+            size,
+            ttl=self.cache_ttl.total_seconds(),
+        )
+
     def clear_cache(self):
         """Clear the concept discovery cache to force re-discovery."""
-        self._cached_concepts = None
+        self.cache.pop(CONCEPTS_NAMESPACE, self._cache_key)
@@ -0,0 +1,189 @@
+"""On-disk cache of GitHub responses that survives restarts.
+
+File bodies are stored once per git blob SHA under ``blobs/``, so a file
+reached through different paths or fetched again after a restart is never
+downloaded twice. Every cached request (a file path, a directory listing,
+the tree) has a small JSON entry under ``entries/`` holding its validators,
+the time it was stored and either the blob SHA of its body or the JSON data
+itself.
+
+Files are written atomically. When the total size exceeds the byte budget,
+the least recently used files are deleted; a file's modification time
+records its last use, so recency carries over restarts too. All methods
+may be called from worker threads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .index_store import _write_atomic
+
+BLOBS_DIR = "blobs"
+ENTRIES_DIR = "entries"
+
+
+class DiskCache:
+    """Byte-budgeted, content-addressed response cache in a directory."""
+
+    def __init__(self, root: Path, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            root: Directory holding the cache; created on first write
+            max_bytes: Total size above which least recently used files are
+                deleted
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        # Path -> (size, last use), scanned from disk on first use
+        self._files: Optional[Dict[Path, Tuple[int, float]]] = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.root / BLOBS_DIR / sha[:2] / sha
+
+    def _entry_path(self, key: str) -> Path:
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.root / ENTRIES_DIR / f"{name}.json"
+
+    def _index(self) -> Dict[Path, Tuple[int, float]]:
+        if self._files is None:
+            self._files = {}
+            if self.root.exists():
+                for path in self.root.rglob("*"):
+                    if path.is_file() and not path.name.startswith("."):
+                        stat = path.stat()
+                        self._files[path] = (stat.st_size, stat.st_mtime)
+        return self._files
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+            # Bump the modification time so eviction sees the use
+            os.utime(path)
+        except OSError:
+            self._index().pop(path, None)
+            return None
+        stat = path.stat()
+        self._index()[path] = (stat.st_size, stat.st_mtime)
+        return data
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, lambda f: f.write(data))
+        stat = path.stat()
+        self._index()[path] = (stat.st_size, stat.st_mtime)
+        self._evict(keep=path)
+
+    def _evict(self, keep: Path):
+        files = self._index()
+        total = sum(size for size, _ in files.values())
+        if total <= self.max_bytes:
+            return
+        for path, (size, _) in sorted(files.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            del files[path]
+            total -= size
+            self.evictions += 1
+
+    def get_blob(self, sha: str) -> Optional[str]:
+        """Body stored for a blob SHA, or None."""
+        with self._lock:
+            data = self._read(self._blob_path(sha))
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data.decode("utf-8")
+
+    def put_blob(self, sha: str, text: str):
+        """Store a body under its blob SHA; existing blobs are left alone."""
+        path = self._blob_path(sha)
+        with self._lock:
+            if path not in self._index():
+                self._write(path, text.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, Dict[str, str]]]:
+        """
+        Look up a cached request.
+
+        Returns:
+            Tuple of (data, time stored as a UNIX timestamp, validators), or
+            None if the entry or the blob it refers to is missing
+        """
+        with self._lock:
+            raw = self._read(self._entry_path(key))
+            try:
+                entry = json.loads(raw) if raw is not None else None
+            except ValueError:
+                entry = None
+            if entry is None or entry.get("key") != key:
+                self.misses += 1
+                return None
+            if "blob" in entry:
+                data = self.get_blob(entry["blob"])
+                if data is None:
+                    return None
+            else:
+                self.hits += 1
+                data = entry["data"]
+        return data, entry["stored_at"], entry.get("validators", {})
+
+    def put(
+        self,
+        key: str,
+        data: Any,
+        stored_at: float,
+        validators: Dict[str, str],
+        blob_sha: Optional[str] = None,
+    ):
+        """
+        Store a request's response.
+
+        Args:
+            key: Cache key of the request
+            data: Body text when ``blob_sha`` is given, JSON data otherwise
+            stored_at: UNIX timestamp the response was stored or revalidated
+            validators: ETag / Last-Modified of the response
+            blob_sha: Git blob SHA of a file body, which is then stored once
+                under ``blobs/`` and referenced by the entry
+        """
+        entry: Dict[str, Any] = {"key": key, "stored_at": stored_at, "validators": validators}
+        if blob_sha is not None:
+            entry["blob"] = blob_sha
+        else:
+            entry["data"] = data
+        encoded = json.dumps(entry).encode("utf-8")
+        with self._lock:
+            if blob_sha is not None:
+                self.put_blob(blob_sha, data)
+            self._write(self._entry_path(key), encoded)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = len(self._index())
+            total_bytes = sum(size for size, _ in self._index().values())
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.root),
+            "files": files,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,110 @@
+"""Interface of the places documentation is read from.
+
+A source lists the ``.mdx`` files under ``docs/en``, reads them and reports
+a revision that changes whenever any of them does. Every file is described
+by ``doc_file_info``, and its ``sha`` is the git blob SHA of the content, so
+listings of different sources are interchangeable: an index built from
+GitHub stays valid when the same files are read from a local checkout, and
+vice versa.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+DOCS_PATH = "docs/en"
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA-1 that git (and the GitHub APIs) report for a file with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def doc_file_info(path: str, sha: Optional[str], size: Optional[int]) -> Dict[str, Any]:
+    """Describe a documentation file the same way for every source."""
+    relative_path = path.replace(f"{DOCS_PATH}/", "", 1)
+    return {
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "relative_path": relative_path,
+        "sha": sha,
+        "size": size,
+        "category": relative_path.split("/")[0] if "/" in relative_path else "root",
+    }
+
+
+class DocsSource(ABC):
+    """Lists and reads the documentation files and tells when they changed."""
+
+    #: Whether ``iter_archive_doc_files`` delivers all files in one transfer,
+    #: which pays off over per-file reads for large builds
+    bulk_download = False
+
+    @abstractmethod
+    async def get_all_doc_files(self) -> List[Dict[str, Any]]:
+        """
+        Describe every ``.mdx`` file under ``docs/en``.
+
+        Returns:
+            ``doc_file_info`` dicts sorted by path
+        """
+
+    @abstractmethod
+    async def list_docs_files(self, subpath: str = "") -> List[Dict[str, Any]]:
+        """
+        List one documentation directory.
+
+        Args:
+            subpath: Directory relative to ``docs/en``
+
+        Returns:
+            Entries with name, path, type ("file" or "dir"), and sha and size
+            for files; empty if the directory does not exist
+        """
+
+    @abstractmethod
+    async def fetch_file_content(self, path: str, sha: Optional[str] = None) -> Optional[str]:
+        """
+        Read one file.
+
+        Args:
+            path: Repository path, e.g. ``docs/en/concepts/agents.mdx``
+            sha: Blob SHA from a listing, if known, so caches can be keyed by it
+
+        Returns:
+            The file's text, or None if it cannot be read
+        """
+
+    async def iter_archive_doc_files(self) -> AsyncIterator[Tuple[Dict[str, Any], str]]:
+        """Yield (file description, content) for all files in one transfer."""
+        raise NotImplementedError(f"{type(self).__name__} has no bulk download")
+        yield  # pragma: no cover - makes this an async generator
+
+    async def revision(self) -> Optional[str]:
+        """
+        Identify the current state of ``docs/en`` cheaply.
+
+        Equal revisions mean equal documentation, so an index built at a
+        revision is fresh as long as the source still reports it. This
+        default hashes the listing; sources with a cheaper way (such as a
+        git tree SHA) override it.
+
+        Returns:
+            Opaque revision string, or None if it cannot be determined
+        """
+        files = await self.get_all_doc_files()
+        listing = "\n".join(f"{f['relative_path']} {f.get('sha')}" for f in files)
+        return hashlib.blake2b(listing.encode("utf-8"), digest_size=20).hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        """Source-specific statistics for status reports."""
+        return {}
+
+    async def close(self):
+        """Release connections or other resources."""
+
+    async def __aenter__(self) -> "DocsSource":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
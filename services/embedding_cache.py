@@ -0,0 +1,170 @@
+"""LRU cache for query embeddings with optional TTL and on-disk persistence."""
+
+import base64
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace so trivially different spellings share an entry."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class EmbeddingCache:
+    """
+    Bounded in-memory LRU of query vectors keyed by (model, normalized text).
+
+    When ``path`` is set, every new entry is appended to a JSON-lines file
+    that is replayed on startup, so a restarted server starts warm. The file
+    is compacted once it holds twice as many lines as the cache can keep.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of vectors kept in memory
+            ttl: Seconds after which an entry expires, or None to never expire
+            path: Optional JSON-lines file used to persist entries
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = (
+            OrderedDict()
+        )
+        self._persisted_lines = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, text: str, model: str) -> Optional[np.ndarray]:
+        """Return the cached vector for ``text`` or None on a miss."""
+        key = (model, normalize_query(text))
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry[1]):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, text: str, model: str, vector: np.ndarray):
+        """Store a vector, evicting the least recently used entry if full."""
+        key = (model, normalize_query(text))
+        created_at = time.time()
+        vector = np.asarray(vector, dtype=np.float32)
+        self._insert(key, vector, created_at)
+
+        if self.path:
+            self._append(key, vector, created_at)
+
+    def _insert(self, key: Tuple[str, str], vector: np.ndarray, created_at: float):
+        self._entries[key] = (vector, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _encode(key: Tuple[str, str], vector: np.ndarray, created_at: float) -> str:
+        return json.dumps(
+            {
+                "model": key[0],
+                "text": key[1],
+                "created_at": created_at,
+                "vector": base64.b64encode(vector.tobytes()).decode("ascii"),
+            }
+        )
+
+    def _load(self):
+        """Replay persisted entries, oldest first, skipping expired ones."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._persisted_lines += 1
+                    try:
+                        record = json.loads(line)
+                        vector = np.frombuffer(
+                            base64.b64decode(record["vector"]), dtype=np.float32
+                        )
+                        key = (record["model"], record["text"])
+                        created_at = float(record["created_at"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if not self._expired(created_at):
+                        self._insert(key, vector, created_at)
+        except OSError as e:
+            logging.warning(f"Could not read query embedding cache {self.path}: {e}")
+        self.evictions = 0
+
+    def _append(self, key: Tuple[str, str], vector: np.ndarray, created_at: float):
+        """Persist one entry, compacting the file when it has grown too long."""
+        try:
+            if self._persisted_lines >= 2 * self.max_entries:
+                self._compact()
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(self._encode(key, vector, created_at) + "\n")
+                self._persisted_lines += 1
+        except OSError as e:
+            logging.warning(f"Could not persist query embedding cache: {e}")
+
+    def _compact(self):
+        """Rewrite the file with only the entries currently in memory."""
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, (vector, created_at) in self._entries.items():
+                f.write(self._encode(key, vector, created_at) + "\n")
+        tmp_path.replace(self.path)
+        self._persisted_lines = len(self._entries)
+
+    def clear(self):
+        """Drop all entries from memory and disk."""
+        self._entries.clear()
+        if self.path and self.path.exists():
+            self.path.unlink()
+        self._persisted_lines = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and configuration for status reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "persistent": self.path is not None,
+        }
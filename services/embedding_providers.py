@@ -0,0 +1,137 @@
+"""Embedding backends behind one interface.
+
+``OpenAIEmbeddingProvider`` calls the embeddings API. ``LocalEmbeddingProvider``
+hashes character n-grams into a fixed number of buckets with NumPy: no
+network, no model download, and the same text always gives the same vector.
+Its vectors capture spelling overlap rather than meaning, so it is meant for
+offline development, CI and benchmarks, and as a stand-in when the API is
+unavailable.
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from .scoring import normalize_rows
+
+DEFAULT_OPENAI_MODEL = "text-embedding-3-small"
+
+# Native output sizes of the OpenAI embedding models
+OPENAI_DIMENSIONS: Dict[str, int] = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+# 64-bit FNV-1a parameters for hashing n-grams
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+class EmbeddingProvider(ABC):
+    """Turns batches of texts into fixed-size vectors."""
+
+    #: Identifier stored in index manifests and cache keys
+    model: str
+    #: Length of every vector returned by ``embed``
+    dimension: int
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts in one request.
+
+        Returns:
+            Float32 matrix of shape (len(texts), dimension), in input order
+        """
+
+    async def embed_once(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch with exactly one request, leaving retries to the caller.
+
+        ``EmbeddingScheduler`` retries with its own backoff, so a client that
+        also retries internally would multiply the requests per batch.
+        """
+        return await self.embed(texts)
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embeddings from the OpenAI API."""
+
+    def __init__(self, model: str = DEFAULT_OPENAI_MODEL, api_key: Optional[str] = None):
+        """
+        Args:
+            model: OpenAI embedding model
+            api_key: API key; defaults to the OPENAI_API_KEY environment variable
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable not set")
+        self.client = AsyncOpenAI(api_key=api_key)
+        self._client_once = self.client.with_options(max_retries=0)
+        self.model = model
+        self.dimension = OPENAI_DIMENSIONS.get(model, 1536)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        response = await self.client.embeddings.create(model=self.model, input=texts)
+        return np.asarray([item.embedding for item in response.data], dtype=np.float32)
+
+    async def embed_once(self, texts: List[str]) -> np.ndarray:
+        response = await self._client_once.embeddings.create(model=self.model, input=texts)
+        return np.asarray([item.embedding for item in response.data], dtype=np.float32)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Deterministic hashed character n-gram vectors computed in-process."""
+
+    def __init__(self, dimension: int = 512, ngram_sizes: Sequence[int] = (3, 4, 5)):
+        """
+        Args:
+            dimension: Number of hash buckets, i.e. the vector length
+            ngram_sizes: Character n-gram lengths to hash
+        """
+        self.dimension = dimension
+        self.ngram_sizes = tuple(ngram_sizes)
+        sizes = "".join(str(n) for n in self.ngram_sizes)
+        self.model = f"local-ngram{sizes}-{dimension}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        # Hashing is CPU bound; NumPy releases the GIL for most of it
+        return await asyncio.to_thread(self.embed_sync, texts)
+
+    def embed_sync(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts without an event loop."""
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = self._vector(text)
+        return normalize_rows(matrix)
+
+    def _vector(self, text: str) -> np.ndarray:
+        """Signed bucket counts of the text's n-grams, log-damped."""
+        # Collapse whitespace and pad so word boundaries form n-grams too
+        padded = f" {' '.join(text.lower().split())} ".encode("utf-8")
+        data = np.frombuffer(padded, dtype=np.uint8).astype(np.uint64)
+
+        buckets, signs = [], []
+        for n in self.ngram_sizes:
+            count = len(data) - n + 1
+            if count <= 0:
+                continue
+            hashes = np.full(count, _FNV_OFFSET, dtype=np.uint64)
+            for offset in range(n):
+                hashes = (hashes ^ data[offset : offset + count]) * _FNV_PRIME
+            buckets.append((hashes % np.uint64(self.dimension)).astype(np.int64))
+            signs.append(np.where(hashes >> np.uint64(63), -1.0, 1.0))
+
+        if not buckets:
+            return np.zeros(self.dimension, dtype=np.float32)
+        counts = np.bincount(
+            np.concatenate(buckets),
+            weights=np.concatenate(signs),
+            minlength=self.dimension,
+        )
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
@@ -0,0 +1,160 @@
+"""Concurrent, token-budgeted embedding requests with retry and backoff."""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+import numpy as np
+from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+# Rough OpenAI tokenizer ratio for English prose and code
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a tokenizer."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, server errors and network failures are worth retrying."""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Read a server-specified delay from a Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingScheduler:
+    """
+    Embeds many texts by packing them into batches by estimated token count
+    and sending several batches at once. Vectors come back in input order.
+
+    Concurrent ``embed`` calls share one limit of ``max_concurrency`` requests
+    in flight, so a producer can hand over texts as they become ready.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        max_concurrency: int = 4,
+        max_batch_tokens: int = 100_000,
+        max_batch_size: int = 512,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """
+        Args:
+            embed_batch: Coroutine embedding a list of texts in one request
+            max_concurrency: Batches in flight at the same time
+            max_batch_tokens: Estimated token budget per request
+            max_batch_size: Maximum number of inputs per request
+            max_retries: Attempts after the first before a batch fails
+            base_delay: First backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+        """
+        self.embed_batch = embed_batch
+        self.max_concurrency = max_concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def pack(self, texts: Sequence[str]) -> List[List[int]]:
+        """Group text indices into batches that fit the token and size budgets."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = estimate_tokens(text)
+            if current and (
+                current_tokens + tokens > self.max_batch_tokens
+                or len(current) >= self.max_batch_size
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed all texts.
+
+        Returns:
+            Float32 matrix with one row per input text, in input order
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        batches = self.pack(texts)
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        done = 0
+
+        async def run(batch: List[int]):
+            nonlocal done
+            async with self._semaphore:
+                batch_vectors = await self._embed_with_retry(
+                    [texts[index] for index in batch]
+                )
+            for index, vector in zip(batch, batch_vectors):
+                vectors[index] = vector
+            done += len(batch)
+            print(f"   Embedded {done}/{len(texts)} chunks...")
+
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def _embed_with_retry(self, batch_texts: List[str]) -> List[List[float]]:
+        """Send one batch, retrying transient failures with jittered backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                batch_vectors = await self.embed_batch(batch_texts)
+                if len(batch_vectors) != len(batch_texts):
+                    raise ValueError(
+                        f"Got {len(batch_vectors)} embeddings for {len(batch_texts)} inputs"
+                    )
+                return batch_vectors
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+
+                delay = _retry_after(e)
+                if delay is None:
+                    backoff = min(self.max_delay, self.base_delay * 2**attempt)
+                    delay = random.uniform(backoff / 2, backoff)
+                logging.warning(
+                    f"Embedding batch of {len(batch_texts)} failed ({e}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
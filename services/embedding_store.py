@@ -0,0 +1,206 @@
+"""Content-addressed store of chunk embeddings shared by all index builds.
+
+A vector is keyed by a hash of the embedding model and the exact text that
+was embedded, so a chunk whose text did not change is never sent to the API
+again, whether it comes from an unchanged file, a file that only changed
+elsewhere, or a rebuild with different chunker settings. Identical texts in
+one build are embedded once.
+
+Each model has a directory holding ``meta.json`` (model and dimension) and
+``vectors.bin``: fixed-size records of a 16-byte key followed by the float32
+vector. New vectors are appended; a torn trailing record from a crash is
+ignored on the next open.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .index_store import _write_atomic
+
+KEY_BYTES = 16
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.bin"
+
+
+def content_key(text: str, model: str) -> str:
+    """Hex key of a text embedded with a model."""
+    return hashlib.blake2b(
+        f"{model}\n{text}".encode("utf-8"), digest_size=KEY_BYTES
+    ).hexdigest()
+
+
+def _record_dtype(dimension: int) -> np.dtype:
+    return np.dtype([("key", np.uint8, (KEY_BYTES,)), ("vector", "<f4", (dimension,))])
+
+
+class EmbeddingStore:
+    """Maps content keys to embedding vectors on disk, one file per model."""
+
+    def __init__(self, root: Path, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            root: Directory holding one subdirectory per model
+            max_bytes: Size per model above which unreferenced vectors are
+                dropped by ``collect``
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._rows: Dict[str, Dict[str, int]] = {}
+        self._dimensions: Dict[str, int] = {}
+        self.added = 0
+
+    def _model_dir(self, model: str) -> Path:
+        return self.root / re.sub(r"[^A-Za-z0-9._-]", "_", model)
+
+    def _dimension(self, model: str) -> Optional[int]:
+        if model not in self._dimensions:
+            try:
+                with open(self._model_dir(model) / META_FILE, encoding="utf-8") as f:
+                    self._dimensions[model] = json.load(f)["dimension"]
+            except (OSError, ValueError, KeyError):
+                return None
+        return self._dimensions[model]
+
+    def _records(self, model: str) -> Optional[np.ndarray]:
+        """Memory-map the complete records of a model, or None if there are none."""
+        dimension = self._dimension(model)
+        path = self._model_dir(model) / VECTORS_FILE
+        if dimension is None or not path.exists():
+            return None
+        dtype = _record_dtype(dimension)
+        count = path.stat().st_size // dtype.itemsize
+        if not count:
+            return None
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _index(self, model: str) -> Dict[str, int]:
+        """Row of every stored key for a model, loaded on first use."""
+        if model not in self._rows:
+            records = self._records(model)
+            rows: Dict[str, int] = {}
+            if records is not None:
+                hex_keys = np.ascontiguousarray(records["key"]).tobytes().hex()
+                step = KEY_BYTES * 2
+                for row in range(len(records)):
+                    rows[hex_keys[row * step : (row + 1) * step]] = row
+            self._rows[model] = rows
+        return self._rows[model]
+
+    def missing(self, keys: Iterable[str], model: str) -> List[str]:
+        """Unique keys without a stored vector, in first-seen order."""
+        rows = self._index(model)
+        return [key for key in dict.fromkeys(keys) if key not in rows]
+
+    def get_many(self, keys: Sequence[str], model: str) -> np.ndarray:
+        """
+        Look up stored vectors.
+
+        Returns:
+            Float32 matrix with one row per key
+
+        Raises:
+            KeyError: If a key has no stored vector
+        """
+        rows = self._index(model)
+        row_ids = np.fromiter((rows[key] for key in keys), dtype=np.int64, count=len(keys))
+        records = self._records(model)
+        if records is None:
+            return np.empty((0, self._dimension(model) or 0), dtype=np.float32)
+        return np.array(records["vector"][row_ids], dtype=np.float32)
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray, model: str):
+        """Append vectors for keys that are not stored yet."""
+        rows = self._index(model)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dimension = self._dimension(model)
+        if dimension is None:
+            dimension = vectors.shape[1]
+            model_dir = self._model_dir(model)
+            model_dir.mkdir(parents=True, exist_ok=True)
+            meta = json.dumps({"model": model, "dimension": dimension}).encode("utf-8")
+            _write_atomic(model_dir / META_FILE, lambda f: f.write(meta))
+            self._dimensions[model] = dimension
+        if vectors.shape[1:] != (dimension,):
+            raise ValueError(
+                f"Expected {dimension}-dimensional vectors for {model}, got {vectors.shape}"
+            )
+
+        new = [i for i, key in enumerate(keys) if key not in rows]
+        if not new:
+            return
+        records = np.zeros(len(new), dtype=_record_dtype(dimension))
+        records["key"] = np.frombuffer(
+            bytes.fromhex("".join(keys[i] for i in new)), dtype=np.uint8
+        ).reshape(len(new), KEY_BYTES)
+        records["vector"] = vectors[new]
+
+        path = self._model_dir(model) / VECTORS_FILE
+        with open(path, "ab") as f:
+            # Drop a torn record left by a crash so appends stay aligned
+            f.truncate(len(rows) * records.dtype.itemsize)
+            f.write(records.tobytes())
+        start = len(rows)
+        for offset, i in enumerate(new):
+            rows[keys[i]] = start + offset
+        self.added += len(new)
+
+    def collect(self, live_keys: Iterable[str]) -> int:
+        """
+        Shrink every model over ``max_bytes`` by dropping unreferenced vectors.
+
+        Vectors referenced by ``live_keys`` are always kept; of the rest, the
+        most recently added are kept while they fit in the budget.
+
+        Returns:
+            Bytes freed
+        """
+        live = set(live_keys)
+        freed = 0
+        if not self.root.exists():
+            return freed
+
+        for model_dir in self.root.iterdir():
+            path = model_dir / VECTORS_FILE
+            if not path.exists() or path.stat().st_size <= self.max_bytes:
+                continue
+            with open(model_dir / META_FILE, encoding="utf-8") as f:
+                model = json.load(f)["model"]
+
+            records = self._records(model)
+            rows = self._index(model)
+            keep = np.zeros(len(records), dtype=bool)
+            for key, row in rows.items():
+                keep[row] = key in live
+            # Rows are in insertion order, so the newest unreferenced are last
+            unreferenced = np.flatnonzero(~keep)
+            budget = self.max_bytes // records.dtype.itemsize - int(keep.sum())
+            spare = max(0, min(budget, len(unreferenced)))
+            if spare:
+                keep[unreferenced[-spare:]] = True
+
+            kept = np.array(records[keep])
+            del records
+            before = path.stat().st_size
+            _write_atomic(path, lambda f: f.write(kept.tobytes()))
+            freed += before - path.stat().st_size
+            self._rows.pop(model, None)
+        return freed
+
+    def stats(self) -> Dict[str, Any]:
+        models = {}
+        if self.root.exists():
+            for model_dir in self.root.iterdir():
+                path = model_dir / VECTORS_FILE
+                if path.exists():
+                    models[model_dir.name] = path.stat().st_size
+        return {
+            "models": models,
+            "total_bytes": sum(models.values()),
+            "max_bytes_per_model": self.max_bytes,
+            "added": self.added,
+        }
@@ -0,0 +1,134 @@
+"""Precomputed metadata filter masks for restricting vector search."""
+
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Chunk fields with one precomputed boolean mask per distinct value
+MASK_FIELDS = ("category", "chunk_type", "has_code_blocks", "heading_level")
+
+# Ad-hoc path prefixes (not ending on a directory) are cached up to this many
+MAX_CACHED_PREFIXES = 256
+
+FilterValue = Union[Any, List[Any], None]
+
+
+def _as_values(value: FilterValue) -> List[Any]:
+    """Normalize a single filter value or a list of alternatives to a list."""
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+class FilterIndex:
+    """Boolean row masks per metadata value, combined before scoring."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        self._masks: Dict[str, Dict[Any, np.ndarray]] = {}
+        for field in MASK_FIELDS:
+            if field in df.columns:
+                self._masks[field] = self._value_masks(df[field])
+
+        self._paths = df["path"].to_numpy(dtype=object) if "path" in df else None
+        self._prefix_masks = self._directory_masks(df["path"]) if "path" in df else {}
+        self._adhoc_prefix_masks: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _value_masks(column: pd.Series) -> Dict[Any, np.ndarray]:
+        """Build one mask per distinct value of a column."""
+        codes, uniques = pd.factorize(column)
+        return {value: codes == code for code, value in enumerate(uniques.tolist())}
+
+    @staticmethod
+    def _directory_masks(paths: pd.Series) -> Dict[str, np.ndarray]:
+        """Build one mask per directory prefix (e.g. ``concepts/``)."""
+        codes, unique_paths = pd.factorize(paths)
+        prefix_codes: Dict[str, List[int]] = {}
+        for code, path in enumerate(unique_paths.tolist()):
+            parts = path.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                prefix = "/".join(parts[:depth]) + "/"
+                prefix_codes.setdefault(prefix, []).append(code)
+        return {
+            prefix: np.isin(codes, path_codes)
+            for prefix, path_codes in prefix_codes.items()
+        }
+
+    def _field_mask(self, field: str, value: FilterValue) -> np.ndarray:
+        """OR together the masks of every requested value of a field."""
+        masks = self._masks.get(field, {})
+        mask = np.zeros(self.size, dtype=bool)
+        for item in _as_values(value):
+            if item in masks:
+                mask |= masks[item]
+        return mask
+
+    def _prefix_mask(self, value: FilterValue) -> np.ndarray:
+        """OR together the masks of every requested path prefix."""
+        mask = np.zeros(self.size, dtype=bool)
+        for prefix in _as_values(value):
+            mask |= self._single_prefix_mask(str(prefix).lstrip("/"))
+        return mask
+
+    def _single_prefix_mask(self, prefix: str) -> np.ndarray:
+        """Look up a precomputed directory mask or compute and cache one."""
+        if prefix in self._prefix_masks:
+            return self._prefix_masks[prefix]
+        if f"{prefix}/" in self._prefix_masks:
+            return self._prefix_masks[f"{prefix}/"]
+        if prefix not in self._adhoc_prefix_masks:
+            if len(self._adhoc_prefix_masks) >= MAX_CACHED_PREFIXES:
+                self._adhoc_prefix_masks.clear()
+            if self._paths is None:
+                mask = np.zeros(self.size, dtype=bool)
+            else:
+                mask = np.fromiter(
+                    (path.startswith(prefix) for path in self._paths),
+                    dtype=bool,
+                    count=self.size,
+                )
+            self._adhoc_prefix_masks[prefix] = mask
+        return self._adhoc_prefix_masks[prefix]
+
+    def rows(
+        self,
+        category: FilterValue = None,
+        chunk_type: FilterValue = None,
+        has_code_blocks: Optional[bool] = None,
+        heading_level: FilterValue = None,
+        path_prefix: FilterValue = None,
+        match: str = "all",
+    ) -> Optional[np.ndarray]:
+        """
+        Resolve filters to the row ids that should be scored.
+
+        Each filter takes a single value or a list of alternatives (OR).
+        Filters on different fields are combined with AND when ``match`` is
+        ``"all"`` and with OR when it is ``"any"``.
+
+        Returns:
+            Sorted row ids, or None if no filter was given
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+
+        masks: List[np.ndarray] = [
+            self._field_mask(field, value)
+            for field, value in (
+                ("category", category),
+                ("chunk_type", chunk_type),
+                ("has_code_blocks", has_code_blocks),
+                ("heading_level", heading_level),
+            )
+            if value is not None
+        ]
+        if path_prefix is not None:
+            masks.append(self._prefix_mask(path_prefix))
+
+        if not masks:
+            return None
+
+        combine = np.logical_and if match == "all" else np.logical_or
+        return np.flatnonzero(combine.reduce(masks))
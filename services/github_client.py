@@ -1,97 +1,527 @@
 """GitHub API client for fetching CrewAI documentation."""
 
+import asyncio
+import io
+import json
 import os
+import tarfile
 import aiohttp
-from typing import Dict, List, Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+from .disk_cache import DiskCache
+from .docs_source import DOCS_PATH, DocsSource, doc_file_info, git_blob_sha
+from .memory_cache import MemoryCache
+from .rate_limiter import RateLimitScheduler
+from .single_flight import SingleFlight
+
 load_dotenv()
 
 # GitHub configuration
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
 CREWAI_REPO = "crewAIInc/crewAI"
-DOCS_PATH = "docs/en"
+CREWAI_BRANCH = "main"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")  # Optional, for higher rate limits
 
-# Cache configuration
-cache = {}
+# Archive downloads can take much longer than one request; only stalls time out
+ARCHIVE_CHUNK_SIZE = 256 * 1024
+
+# Cache configuration: responses are revalidated once older than CACHE_TTL
+# and dropped from memory after CACHE_MAX_AGE (the disk cache keeps them)
 CACHE_TTL = timedelta(hours=1)
+CACHE_MAX_AGE = timedelta(hours=24)
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Shared by all clients: namespace ("file", "list", "blob", "tree", "revision")
+# and key -> (data, time stored or revalidated, validators, size in bytes)
+cache = MemoryCache(max_bytes=CACHE_MAX_BYTES, ttl=CACHE_MAX_AGE.total_seconds())
+
+# Rate limits apply per token, so all clients in the process share one budget
+rate_limiter = RateLimitScheduler()
+
+# Response validators and the request headers that send them back
+VALIDATOR_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
+
+class _BlockingStreamReader(io.RawIOBase):
+    """File object over an aiohttp response body, read from a worker thread
+    
+    Each read is scheduled on the event loop that owns the response and
+    waited for, so a thread can hand the stream to blocking readers such as
+    ``tarfile`` without buffering the whole download.
+    """
+    
+    def __init__(self, content: aiohttp.StreamReader, loop: asyncio.AbstractEventLoop):
+        self.content = content
+        self.loop = loop
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        future = asyncio.run_coroutine_threadsafe(
+            self.content.read(min(len(buffer), ARCHIVE_CHUNK_SIZE)), self.loop
+        )
+        data = future.result()
+        buffer[:len(data)] = data
+        return len(data)
 
 
-class GitHubDocsClient:
-    """Client for fetching CrewAI documentation from GitHub"""
+class GitHubDocsClient(DocsSource):
+    """Client for fetching CrewAI documentation from GitHub
     
-    def __init__(self):
+    All requests share one pooled ``aiohttp`` session, so connections (and
+    their TLS handshakes) and DNS lookups are reused across fetches. Call
+    ``start()``/``close()`` or use the client as an async context manager to
+    manage it explicitly; otherwise it is opened on first use.
+    """
+    
+    bulk_download = True
+    
+    def __init__(
+        self,
+        max_connections: int = 32,
+        max_connections_per_host: int = 8,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        request_timeout: float = 30.0,
+        listing_concurrency: int = 8,
+        cache_ttl: timedelta = CACHE_TTL,
+        cache_dir: Optional[str] = "./vector_data/github_cache",
+        cache_max_bytes: int = 256 * 1024 * 1024,
+        memory_cache: Optional[MemoryCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+    ):
+        """
+        Args:
+            max_connections: Open connections across all hosts
+            max_connections_per_host: Open connections per host (api / raw)
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            dns_cache_ttl: Seconds a resolved host name is cached
+            request_timeout: Total timeout of a single request in seconds
+            listing_concurrency: Directory listings in flight when the tree
+                has to be walked directory by directory
+            cache_ttl: Age after which a cached response is revalidated with
+                a conditional request; unchanged content costs a 304 only
+            cache_dir: Directory of the on-disk cache that keeps responses
+                across restarts; None keeps them in memory only
+            cache_max_bytes: Size of the on-disk cache above which least
+                recently used files are deleted
+            memory_cache: In-memory cache to use; defaults to the one shared
+                by all clients in the process
+            scheduler: Rate-limit scheduler to pace requests with; defaults
+                to the one shared by all clients in the process
+        """
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "CrewAI-MCP-Server"
         }
         if GITHUB_TOKEN:
             self.headers["Authorization"] = f"token {GITHUB_TOKEN}"
+        
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.listing_concurrency = listing_concurrency
+        self.cache_ttl = cache_ttl
+        self.cache = memory_cache if memory_cache is not None else cache
+        self.scheduler = scheduler if scheduler is not None else rate_limiter
+        self.disk_cache = DiskCache(Path(cache_dir), max_bytes=cache_max_bytes) if cache_dir else None
+        # Conditional requests answered with 304 Not Modified
+        self.not_modified = 0
+        # Concurrent requests for the same file or listing share one fetch
+        self._flights = SingleFlight()
+        # Sessions are bound to an event loop; the standalone server
+        # initializes in a separate thread with its own loop
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
     
-    async def fetch_file_content(self, path: str) -> Optional[str]:
-        """Fetch raw content of a file from GitHub"""
-        cache_key = f"file:{path}"
+    async def start(self) -> aiohttp.ClientSession:
+        """Open the pooled session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self._sessions[loop] = session
+        return session
+    
+    async def close(self):
+        """Close the session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+        # Forget sessions whose loop is gone; they cannot be closed anymore
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            del self._sessions[loop]
+    
+    async def __aenter__(self) -> "GitHubDocsClient":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    @asynccontextmanager
+    async def _get(self, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET a URL through the rate-limit scheduler
         
-        # Check cache
-        if cache_key in cache:
-            cached_data, cached_time = cache[cache_key]
-            if datetime.now() - cached_time < CACHE_TTL:
-                return cached_data
+        Waits until the request fits the host's budget. When GitHub rejects
+        it with 403/429 because of a rate limit, it is retried after the
+        delay the server asks for, unless that exceeds the scheduler's
+        ``max_retry_wait``; the rejection is returned then.
+        """
+        session = await self.start()
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(host)
+            response = await session.get(url, **kwargs)
+            delay = self.scheduler.update(host, response.status, response.headers)
+            if delay is None:
+                break
+            if attempt >= self.scheduler.max_retries or delay > self.scheduler.max_retry_wait:
+                print(f"⚠️ GitHub rate limit hit for {url}, not retrying for {delay:.0f}s")
+                break
+            response.release()
+            attempt += 1
+            self.scheduler.retries += 1
+            print(f"⏳ GitHub rate limit hit, retrying {url} in {delay:.1f}s")
+        try:
+            yield response
+        finally:
+            response.release()
+    
+    async def fetch_file_content(self, path: str, sha: Optional[str] = None) -> Optional[str]:
+        """Fetch raw content of a file from GitHub
         
-        url = f"{GITHUB_RAW_BASE}/{CREWAI_REPO}/main/{path}"
+        When the blob SHA is known, a cached body is only reused if it was
+        stored for that exact SHA, so changed files are never served stale.
+        A raw body that does not hash to the SHA is replaced by the blob
+        itself from the Git Blobs API. Concurrent calls for the same file
+        share one fetch.
+        """
+        return await self._flights.do(("file", path, sha), lambda: self._fetch_file_content(path, sha))
+    
+    async def _fetch_file_content(self, path: str, sha: Optional[str]) -> Optional[str]:
+        if sha:
+            entry = self.cache.get("blob", sha)
+            if entry is not None:
+                return entry[0]
+            content = await asyncio.to_thread(self.disk_cache.get_blob, sha) if self.disk_cache else None
+            if content is not None:
+                self._remember("blob", sha, content, {})
+                return content
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    # Cache the result
-                    cache[cache_key] = (content, datetime.now())
-                    return content
+        url = f"{GITHUB_RAW_BASE}/{CREWAI_REPO}/{CREWAI_BRANCH}/{path}"
+        # A path entry may hold an older version; revalidate it before use
+        content = await self._get_cached(f"file:{path}", url, revalidate=sha is not None, is_file=True)
+        if content is None or not sha:
+            return content
+        if git_blob_sha(content.encode("utf-8")) != sha:
+            # The raw host keeps serving the previous version for a while
+            # after a push; never let it pass for the requested blob
+            content = await self._fetch_blob(sha)
+            if content is None:
                 return None
+        self._remember("blob", sha, content, {})
+        return content
+    
+    async def _fetch_blob(self, sha: str) -> Optional[str]:
+        """Fetch a file by blob SHA through the Git Blobs API
+        
+        Returns:
+            The content, verified against ``sha``, or None if the request
+            failed
+        """
+        url = f"{GITHUB_API_BASE}/repos/{CREWAI_REPO}/git/blobs/{sha}"
+        async with self._get(url, headers={"Accept": "application/vnd.github.raw+json"}) as response:
+            if response.status != 200:
+                return None
+            data = await response.read()
+        if git_blob_sha(data) != sha:
+            print(f"⚠️ Blob {sha} does not match its content")
+            return None
+        content = data.decode("utf-8")
+        if self.disk_cache is not None:
+            try:
+                await asyncio.to_thread(self.disk_cache.put_blob, sha, content)
+            except OSError as e:
+                print(f"⚠️ Could not write blob {sha} to the disk cache: {e}")
+        return content
     
     async def list_docs_files(self, subpath: str = "") -> List[Dict[str, Any]]:
         """List all files in a documentation directory"""
-        cache_key = f"list:{subpath}"
-        
-        # Check cache
-        if cache_key in cache:
-            cached_data, cached_time = cache[cache_key]
-            if datetime.now() - cached_time < CACHE_TTL:
-                return cached_data
-        
+        return await self._flights.do(("list", subpath), lambda: self._list_docs_files(subpath))
+    
+    async def _list_docs_files(self, subpath: str) -> List[Dict[str, Any]]:
         path = f"{DOCS_PATH}/{subpath}".rstrip("/")
         url = f"{GITHUB_API_BASE}/repos/{CREWAI_REPO}/contents/{path}"
+        files = await self._get_cached(f"list:{subpath}", url)
+        return files if files is not None else []
+    
+    async def _get_cached(
+        self,
+        cache_key: str,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        revalidate: bool = False,
+        is_file: bool = False,
+    ) -> Any:
+        """GET a URL through the cache
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
+        Entries younger than ``cache_ttl`` are returned as they are. Older
+        ones (or any entry when ``revalidate`` is set) are revalidated with
+        the ETag / Last-Modified stored alongside them: a 304 refreshes the
+        entry without transferring the body, and on GitHub's API does not
+        count against the rate limit.
+        
+        Entries missing from memory are looked up in the on-disk cache, and
+        every response is written through to it. File bodies (``is_file``)
+        are stored there by blob SHA. Disk I/O runs in a worker thread.
+        
+        When revalidation fails (no network, a 5xx or a rate-limit
+        rejection), a cached entry is served as it is.
+        
+        Returns:
+            The body as text for files or as parsed JSON otherwise, or None if
+            the request failed
+        """
+        namespace, _, key = cache_key.partition(":")
+        entry = self.cache.get(namespace, key)
+        if entry is None and self.disk_cache is not None:
+            stored = await asyncio.to_thread(self.disk_cache.get, cache_key)
+            if stored is not None:
+                data, stored_at, validators = stored
+                entry = self._remember(namespace, key, data, validators, datetime.fromtimestamp(stored_at))
+        if entry is not None and not revalidate and datetime.now() - entry[1] < self.cache_ttl:
+            return entry[0]
+        
+        headers = {}
+        if entry is not None:
+            headers = {
+                VALIDATOR_HEADERS[name]: value for name, value in entry[2].items()
+            }
+        
+        try:
+            async with self._get(url, params=params, headers=headers) as response:
+                if response.status == 304 and entry is not None:
+                    self.not_modified += 1
+                    # Only the memory copy is refreshed; rewriting the body to disk
+                    # for a new timestamp is not worth it. After a restart the disk
+                    # copy is revalidated once more, which costs another 304.
+                    self._remember(namespace, key, entry[0], entry[2], size=entry[3])
+                    return entry[0]
                 if response.status == 200:
-                    files = await response.json()
-                    # Cache the result
-                    cache[cache_key] = (files, datetime.now())
-                    return files
-                return []
-    
-    async def get_all_doc_files(self) -> List[Dict[str, str]]:
-        """Recursively get all documentation files"""
+                    body = await response.read()
+                    data = body.decode("utf-8") if is_file else json.loads(body)
+                    validators = {
+                        name: response.headers[name]
+                        for name in VALIDATOR_HEADERS
+                        if name in response.headers
+                    }
+                    await self._store(cache_key, data, validators, is_file, len(body))
+                    return data
+                if entry is not None and (response.status >= 500 or response.status in (403, 429)):
+                    print(f"⚠️ GitHub answered {response.status} for {url}, serving the cached copy")
+                    return entry[0]
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if entry is None:
+                raise
+            print(f"⚠️ Could not revalidate {url} ({e}), serving the cached copy")
+            return entry[0]
+    
+    def _remember(
+        self,
+        namespace: str,
+        key: str,
+        data: Any,
+        validators: Dict[str, str],
+        stored_at: Optional[datetime] = None,
+        size: Optional[int] = None,
+    ) -> Tuple[Any, datetime, Dict[str, str], int]:
+        """Put a response into the in-memory cache and return its entry"""
+        if size is None:
+            size = len(data.encode("utf-8")) if isinstance(data, str) else len(json.dumps(data))
+        entry = (data, stored_at or datetime.now(), validators, size)
+        self.cache.put(namespace, key, entry, size)
+        return entry
+    
+    async def _store(self, cache_key: str, data: Any, validators: Dict[str, str], is_file: bool, size: int):
+        """Cache a fresh response in memory and on disk"""
+        namespace, _, key = cache_key.partition(":")
+        now = self._remember(namespace, key, data, validators, size=size)[1]
+        if self.disk_cache is not None:
+            try:
+                blob_sha = git_blob_sha(data.encode("utf-8")) if is_file else None
+                await asyncio.to_thread(
+                    self.disk_cache.put, cache_key, data, now.timestamp(), validators, blob_sha=blob_sha
+                )
+            except OSError as e:
+                print(f"⚠️ Could not write {cache_key} to the disk cache: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache and rate-limit statistics"""
+        return {"cache": self.cache_stats(), "rate_limit": self.scheduler.stats()}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Statistics of the in-memory and on-disk response caches"""
+        return {
+            "memory": self.cache.stats(),
+            "disk": self.disk_cache.stats() if self.disk_cache is not None else None,
+            "not_modified": self.not_modified,
+            "single_flight": self._flights.stats(),
+        }
+    
+    async def iter_archive_doc_files(self) -> AsyncIterator[Tuple[Dict[str, Any], str]]:
+        """Stream documentation files out of the repository tarball
+        
+        Downloads the archive of the branch once and decompresses it while it
+        arrives. Only ``docs/en`` ``.mdx`` members are read; nothing is written
+        to disk. Each file is described like in ``get_all_doc_files``, with the
+        blob SHA computed from its content.
+        
+        Yields:
+            Tuples of (file description, file content)
+        """
+        url = f"{GITHUB_API_BASE}/repos/{CREWAI_REPO}/tarball/{CREWAI_BRANCH}"
+        loop = asyncio.get_running_loop()
+        members: asyncio.Queue = asyncio.Queue()
+        
+        def extract(content: aiohttp.StreamReader):
+            try:
+                with tarfile.open(fileobj=_BlockingStreamReader(content, loop), mode="r|*") as archive:
+                    for member in archive:
+                        # Members live under a "<owner>-<repo>-<commit>/" directory
+                        path = member.name.split("/", 1)[-1]
+                        if not (member.isfile() and path.startswith(f"{DOCS_PATH}/") and path.endswith(".mdx")):
+                            continue
+                        data = archive.extractfile(member).read()
+                        file_info = doc_file_info(path, git_blob_sha(data), len(data))
+                        loop.call_soon_threadsafe(members.put_nowait, (file_info, data.decode("utf-8")))
+            finally:
+                loop.call_soon_threadsafe(members.put_nowait, None)
+        
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=self.request_timeout)
+        async with self._get(url, timeout=timeout) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Archive download failed with HTTP {response.status}")
+            
+            extractor = asyncio.ensure_future(asyncio.to_thread(extract, response.content))
+            try:
+                while (item := await members.get()) is not None:
+                    yield item
+                await extractor
+            finally:
+                if not extractor.done():
+                    # Unblocks the extractor's pending read so the thread exits
+                    response.close()
+                    await asyncio.gather(extractor, return_exceptions=True)
+    
+    async def get_tree(self) -> Optional[Dict[str, Any]]:
+        """Fetch the docs directory's tree in one Git Trees API call
+        
+        Only the subtree of ``docs/en`` is requested, found by its SHA, so
+        the rest of the repository is neither transferred nor cached. A tree
+        never changes under its SHA; a new docs revision is a new cache
+        entry. Paths are prefixed to be relative to the repository root, as
+        in a tree of the whole branch.
+        
+        Returns:
+            The Git Trees API response, or None if the docs directory or its
+            tree could not be fetched
+        """
+        docs_sha = await self.revision()
+        if docs_sha is None:
+            return None
+        url = f"{GITHUB_API_BASE}/repos/{CREWAI_REPO}/git/trees/{docs_sha}"
+        tree = await self._get_cached(f"tree:{docs_sha}", url, params={"recursive": "1"})
+        if tree is None:
+            return None
+        return {
+            **tree,
+            "tree": [
+                {**entry, "path": f"{DOCS_PATH}/{entry['path']}"}
+                for entry in tree.get("tree", [])
+            ],
+        }
+    
+    async def revision(self) -> Optional[str]:
+        """Git tree SHA of the docs directory on the branch
+        
+        Read from the listing of its parent directory: one small request,
+        revalidated with the cached ETag, so an unchanged tree costs a 304
+        that does not count against the rate limit.
+        """
+        parent, _, name = DOCS_PATH.rpartition("/")
+        url = f"{GITHUB_API_BASE}/repos/{CREWAI_REPO}/contents/{parent}"
+        entries = await self._get_cached(f"revision:{parent}", url, params={"ref": CREWAI_BRANCH}, revalidate=True)
+        for entry in entries or []:
+            if entry.get("name") == name and entry.get("type") == "dir":
+                return entry.get("sha")
+        return None
+    
+    async def get_all_doc_files(self) -> List[Dict[str, Any]]:
+        """Get all documentation files with their blob SHAs and sizes
+        
+        Uses a recursive Git Trees call for the docs directory, after the
+        request for its SHA. GitHub truncates very large
+        trees; then (or if the call fails) the docs directory is walked with
+        concurrent contents listings instead.
+        """
+        try:
+            tree = await self.get_tree()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"⚠️ Git tree request failed: {e}")
+            tree = None
+        
+        if tree is not None and not tree.get("truncated"):
+            return sorted(
+                (
+                    doc_file_info(entry["path"], entry.get("sha"), entry.get("size"))
+                    for entry in tree.get("tree", [])
+                    if entry.get("type") == "blob"
+                    and entry["path"].startswith(f"{DOCS_PATH}/")
+                    and entry["path"].endswith(".mdx")
+                ),
+                key=lambda f: f["path"]
+            )
+        
+        if tree is not None:
+            print("⚠️ Git tree is truncated, listing directories instead")
+        return await self._traverse_doc_files()
+    
+    async def _traverse_doc_files(self) -> List[Dict[str, Any]]:
+        """Walk the docs directory, listing sibling directories concurrently"""
         all_files = []
+        semaphore = asyncio.Semaphore(self.listing_concurrency)
         
         async def traverse_directory(path: str = ""):
-            files = await self.list_docs_files(path)
+            async with semaphore:
+                files = await self.list_docs_files(path)
+            subdirectories = []
             for file in files:
                 if file["type"] == "file" and file["name"].endswith(".mdx"):
-                    relative_path = file["path"].replace(f"{DOCS_PATH}/", "")
-                    all_files.append({
-                        "name": file["name"],
-                        "path": file["path"],
-                        "relative_path": relative_path,
-                        "category": relative_path.split("/")[0] if "/" in relative_path else "root"
-                    })
+                    all_files.append(doc_file_info(file["path"], file.get("sha"), file.get("size")))
                 elif file["type"] == "dir":
-                    subpath = file["path"].replace(f"{DOCS_PATH}/", "")
-                    await traverse_directory(subpath)
+                    subdirectories.append(file["path"].replace(f"{DOCS_PATH}/", ""))
+            await asyncio.gather(*(traverse_directory(subpath) for subpath in subdirectories))
         
         await traverse_directory()
-        return all_files
\ No newline at end of file
+        return sorted(all_files, key=lambda f: f["path"])
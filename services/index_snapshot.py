@@ -0,0 +1,71 @@
+"""Immutable, searchable view of one index generation."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .ann_index import IVFIndex
+from .bm25_index import BM25Index
+from .filters import FilterIndex
+from .scoring import CompactMatrix, ScoringEngine
+
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    Everything a search reads, bundled so it can be replaced in one assignment.
+
+    A search takes a reference to the current snapshot once and uses only that
+    for the rest of the request, so a rebuild finishing mid-search never mixes
+    rows of one generation with vectors of another.
+    """
+
+    df: pd.DataFrame
+    engine: ScoringEngine
+    filters: FilterIndex
+    records: List[Dict[str, Any]]
+    generation: Optional[str] = None
+    manifest: Dict[str, Any] = field(default_factory=dict)
+    ann: Optional[IVFIndex] = None
+    lexical: Optional[BM25Index] = None
+    compact: Optional[CompactMatrix] = None
+    #: Number of distinct documents, computed once per snapshot
+    total_docs: int = 0
+
+    @classmethod
+    def create(
+        cls,
+        df: pd.DataFrame,
+        embeddings: np.ndarray,
+        normalized: bool,
+        generation: Optional[str] = None,
+        manifest: Optional[Dict[str, Any]] = None,
+        ann: Optional[IVFIndex] = None,
+        lexical: Optional[BM25Index] = None,
+        compact: Optional[CompactMatrix] = None,
+    ) -> "IndexSnapshot":
+        """Derive the scoring engine, filter masks, row dicts and aggregates."""
+        return cls(
+            df=df,
+            engine=ScoringEngine(embeddings, normalized=normalized),
+            filters=FilterIndex(df),
+            # Row dicts share the DataFrame's string objects, so this is cheap
+            records=df.to_dict("records"),
+            generation=generation,
+            manifest=manifest or {},
+            ann=ann,
+            lexical=lexical,
+            compact=compact,
+            total_docs=int(df["path"].nunique()) if "path" in df.columns else 0,
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.engine.matrix
+
+    @property
+    def indexed_files(self) -> Dict[str, str]:
+        """Blob SHA of every file whose chunks are in this snapshot."""
+        return self.manifest.get("files", {})
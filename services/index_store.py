@@ -0,0 +1,370 @@
+"""On-disk storage for the vector search index.
+
+An index directory holds:
+
+- ``manifest.json``: format version, embedding model, matrix shape and build time
+- ``embeddings.npy``: one contiguous float32 matrix, opened with ``np.memmap``
+- ``chunks.json``: column-oriented chunk metadata (everything except vectors)
+- ``<name>.npz``: optional derived structures (e.g. an ANN index), listed in
+  the manifest under ``artifacts``
+
+Loading maps the matrix straight from disk, so opening an index costs a few
+milliseconds regardless of its size.
+
+``GenerationStore`` keeps each build in its own directory under
+``generations/`` and names the live one in a ``CURRENT`` file. A new build
+never touches the files of the generation being served; it becomes live only
+when ``CURRENT`` is atomically replaced.
+"""
+
+import ast
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+INDEX_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.json"
+LEGACY_CSV_FILE = "embeddings.csv"
+GENERATIONS_DIR = "generations"
+CURRENT_FILE = "CURRENT"
+
+# Columns derived from others at build time and not worth storing twice
+DERIVED_COLUMNS = ("embedding", "combined")
+
+
+class IndexFormatError(ValueError):
+    """Raised when an index directory is missing files or has the wrong format."""
+
+
+def _write_atomic(path: Path, write) -> None:
+    """Write a file via a temporary sibling and rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class IndexStore:
+    """Reads and writes a versioned embedding index in a directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    @property
+    def embeddings_path(self) -> Path:
+        return self.root / EMBEDDINGS_FILE
+
+    @property
+    def chunks_path(self) -> Path:
+        return self.root / CHUNKS_FILE
+
+    @property
+    def legacy_csv_path(self) -> Path:
+        return self.root / LEGACY_CSV_FILE
+
+    def artifact_path(self, name: str) -> Path:
+        return self.root / f"{name}.npz"
+
+    def exists(self) -> bool:
+        """Check whether a complete index is present."""
+        return (
+            self.manifest_path.exists()
+            and self.embeddings_path.exists()
+            and self.chunks_path.exists()
+        )
+
+    def read_manifest(self) -> Dict[str, Any]:
+        """Read and validate the index manifest."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise IndexFormatError(f"Unreadable manifest {self.manifest_path}: {e}")
+
+        version = manifest.get("format_version")
+        if version != INDEX_FORMAT_VERSION:
+            raise IndexFormatError(
+                f"Unsupported index format version {version} "
+                f"(expected {INDEX_FORMAT_VERSION})"
+            )
+        return manifest
+
+    def save(
+        self,
+        df: pd.DataFrame,
+        embeddings: np.ndarray,
+        model: str,
+        extra: Optional[Dict[str, Any]] = None,
+        artifacts: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist chunk metadata and their embedding matrix.
+
+        The manifest is written last, so a crash mid-save never leaves a
+        directory that ``exists()`` reports as complete with mismatched files.
+
+        Args:
+            df: Chunk metadata, one row per embedding
+            embeddings: Matrix of shape (len(df), dimension)
+            model: Embedding model the vectors came from
+            extra: Additional manifest fields
+            artifacts: Named groups of arrays derived from the matrix
+
+        Returns:
+            The manifest that was written
+        """
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(df):
+            raise IndexFormatError(
+                f"Embedding matrix shape {matrix.shape} does not match {len(df)} chunks"
+            )
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        if self.manifest_path.exists():
+            self.manifest_path.unlink()
+
+        _write_atomic(self.embeddings_path, lambda f: np.save(f, matrix))
+
+        columns = {
+            column: df[column].tolist()
+            for column in df.columns
+            if column not in DERIVED_COLUMNS
+        }
+        chunks_bytes = json.dumps(columns, ensure_ascii=False).encode("utf-8")
+        _write_atomic(self.chunks_path, lambda f: f.write(chunks_bytes))
+
+        for name, arrays in (artifacts or {}).items():
+            _write_atomic(self.artifact_path(name), lambda f: np.savez(f, **arrays))
+
+        manifest = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "model": model,
+            "count": int(matrix.shape[0]),
+            "dimension": int(matrix.shape[1]),
+            "dtype": "float32",
+            "created_at": datetime.now().isoformat(),
+            "artifacts": sorted(artifacts or {}),
+            **(extra or {}),
+        }
+        manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
+        _write_atomic(self.manifest_path, lambda f: f.write(manifest_bytes))
+        return manifest
+
+    def update_manifest(self, **fields: Any) -> Dict[str, Any]:
+        """
+        Set manifest fields of a complete index without touching its data.
+
+        Returns:
+            The manifest that was written
+        """
+        manifest = {**self.read_manifest(), **fields}
+        manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
+        _write_atomic(self.manifest_path, lambda f: f.write(manifest_bytes))
+        return manifest
+
+    def load(self) -> Tuple[pd.DataFrame, np.ndarray, Dict[str, Any]]:
+        """
+        Open the index without copying the embedding matrix into memory.
+
+        Returns:
+            Tuple of (chunk metadata, read-only memory-mapped matrix, manifest)
+        """
+        manifest = self.read_manifest()
+
+        embeddings = np.load(self.embeddings_path, mmap_mode="r")
+        expected_shape = (manifest["count"], manifest["dimension"])
+        if embeddings.dtype != np.float32 or embeddings.shape != expected_shape:
+            raise IndexFormatError(
+                f"Embedding matrix {embeddings.dtype}{embeddings.shape} does not "
+                f"match manifest float32{expected_shape}"
+            )
+
+        with open(self.chunks_path, "r", encoding="utf-8") as f:
+            df = pd.DataFrame(json.load(f))
+        if len(df) != manifest["count"]:
+            raise IndexFormatError(
+                f"Chunk metadata has {len(df)} rows, manifest says {manifest['count']}"
+            )
+
+        # Rebuild the derived embedding input so chunks can be re-embedded
+        if "title" in df.columns and "content" in df.columns:
+            df["combined"] = df["title"] + "\n\n" + df["content"]
+
+        return df, embeddings, manifest
+
+    def read_column(self, name: str) -> List[Any]:
+        """Read one chunk metadata column without building a DataFrame."""
+        with open(self.chunks_path, "r", encoding="utf-8") as f:
+            return json.load(f).get(name, [])
+
+    def load_artifact(
+        self, name: str, manifest: Dict[str, Any]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load a named group of arrays saved alongside the matrix.
+
+        Returns:
+            The arrays, or None if the index was saved without this artifact
+        """
+        if name not in manifest.get("artifacts", []):
+            return None
+        with np.load(self.artifact_path(name), allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    def migrate_legacy_csv(self, model: str, csv_path: Optional[Path] = None) -> bool:
+        """
+        Convert a legacy ``embeddings.csv`` into the binary format once.
+
+        The CSV is renamed to ``embeddings.csv.migrated`` afterwards so the
+        conversion never runs again.
+
+        Args:
+            model: Embedding model the CSV vectors came from
+            csv_path: CSV to convert; defaults to the one in this directory
+
+        Returns:
+            True if a CSV was migrated
+        """
+        csv_path = csv_path or self.legacy_csv_path
+        if not csv_path.exists():
+            return False
+
+        df = pd.read_csv(csv_path)
+        # Vectors were written as Python list reprs, which are valid JSON
+        matrix = np.array(
+            [json.loads(value) for value in df.pop("embedding")], dtype=np.float32
+        )
+        # Empty strings come back from CSV as NaN
+        for column in df.select_dtypes(exclude=["number", "bool"]).columns:
+            df[column] = df[column].fillna("")
+        if "frontmatter" in df.columns:
+            df["frontmatter"] = df["frontmatter"].apply(
+                lambda value: ast.literal_eval(value) if value else {}
+            )
+
+        self.save(df, matrix, model, extra={"migrated_from": LEGACY_CSV_FILE})
+        csv_path.rename(csv_path.with_name(f"{LEGACY_CSV_FILE}.migrated"))
+        return True
+
+
+class GenerationStore:
+    """Index generations side by side, with an atomic pointer to the live one."""
+
+    def __init__(self, root: Path, keep: int = 2):
+        """
+        Args:
+            root: Data directory holding ``generations/`` and ``CURRENT``
+            keep: Complete generations to retain, including the live one
+        """
+        self.root = Path(root)
+        self.keep = max(1, keep)
+
+    @property
+    def generations_dir(self) -> Path:
+        return self.root / GENERATIONS_DIR
+
+    @property
+    def current_path(self) -> Path:
+        return self.root / CURRENT_FILE
+
+    def store(self, generation: str) -> IndexStore:
+        return IndexStore(self.generations_dir / generation)
+
+    def current_id(self) -> Optional[str]:
+        """Name of the live generation, or None if nothing was published."""
+        try:
+            generation = self.current_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if not generation or not self.store(generation).exists():
+            return None
+        return generation
+
+    def current(self) -> Optional[IndexStore]:
+        generation = self.current_id()
+        return self.store(generation) if generation else None
+
+    def list(self) -> List[str]:
+        """Generation names, oldest first."""
+        if not self.generations_dir.exists():
+            return []
+        return sorted(path.name for path in self.generations_dir.iterdir() if path.is_dir())
+
+    def create(self) -> Tuple[str, IndexStore]:
+        """Allocate an empty directory for a new build."""
+        generation = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        store = self.store(generation)
+        store.root.mkdir(parents=True)
+        return generation, store
+
+    def publish(self, generation: str) -> None:
+        """Make a complete generation the live one and prune old ones."""
+        if not self.store(generation).exists():
+            raise IndexFormatError(f"Generation {generation} is incomplete")
+        data = f"{generation}\n".encode("utf-8")
+        _write_atomic(self.current_path, lambda f: f.write(data))
+        self.prune()
+
+    def discard(self, generation: str) -> None:
+        """Delete a generation that will never be published."""
+        shutil.rmtree(self.store(generation).root, ignore_errors=True)
+
+    def prune(self) -> None:
+        """
+        Delete all but the newest ``keep`` complete generations.
+
+        The live generation is always kept. Older generations may still be
+        memory-mapped by in-flight searches; on POSIX their pages stay valid
+        until unmapped.
+        """
+        current = self.current_id()
+        complete = [g for g in self.list() if self.store(g).exists() and g != current]
+        for generation in complete[: max(0, len(complete) - (self.keep - 1))]:
+            self.discard(generation)
+
+    def adopt_legacy(self, model: str) -> Optional[str]:
+        """
+        Move an index saved directly in the data directory into a generation.
+
+        Handles both the flat binary layout and a legacy ``embeddings.csv``.
+
+        Returns:
+            Description of what was adopted, or None if there was nothing to do
+        """
+        if self.current_id() is not None:
+            return None
+
+        flat = IndexStore(self.root)
+        if flat.legacy_csv_path.exists():
+            generation, store = self.create()
+            store.migrate_legacy_csv(model, flat.legacy_csv_path)
+            self.publish(generation)
+            return f"Migrated {LEGACY_CSV_FILE} into generation {generation}"
+
+        if flat.exists():
+            manifest = flat.read_manifest()
+            generation, store = self.create()
+            # Manifest last, so the generation only looks complete once whole
+            paths = [flat.embeddings_path, flat.chunks_path]
+            paths += [flat.artifact_path(name) for name in manifest.get("artifacts", [])]
+            for path in paths + [flat.manifest_path]:
+                os.replace(path, store.root / path.name)
+            self.publish(generation)
+            return f"Moved existing index into generation {generation}"
+
+        return None
@@ -0,0 +1,101 @@
+"""Documentation read from a local checkout or mirror of the crewAI repository."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .docs_source import DOCS_PATH, DocsSource, doc_file_info, git_blob_sha
+
+
+class LocalDocsSource(DocsSource):
+    """
+    Reads ``docs/en`` from a directory instead of GitHub.
+
+    Files are hashed like git hashes blobs, so the SHAs match what GitHub
+    reports and an index built from either source can be updated from the
+    other. A hash is only recomputed when a file's modification time or size
+    changed, which makes repeated listings (and revision checks) cheap.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Repository checkout containing ``docs/en``
+        """
+        self.root = Path(root).resolve()
+        self.docs_dir = self.root / DOCS_PATH
+        # File -> (mtime_ns, size, blob SHA) of the last hash computed
+        self._hashes: Dict[Path, Tuple[int, int, str]] = {}
+        self.hashed = 0
+
+    def _sha(self, path: Path) -> Tuple[str, int]:
+        """Blob SHA and size of a file, reusing the last hash if it is unchanged."""
+        stat = path.stat()
+        cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2], stat.st_size
+        sha = git_blob_sha(path.read_bytes())
+        self.hashed += 1
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, sha)
+        return sha, stat.st_size
+
+    def _resolve(self, path: str) -> Optional[Path]:
+        """File for a repository path, or None if it lies outside ``docs/en``."""
+        resolved = (self.root / path).resolve()
+        if resolved != self.docs_dir and not resolved.is_relative_to(self.docs_dir):
+            return None
+        return resolved
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        files = []
+        if self.docs_dir.is_dir():
+            for path in self.docs_dir.rglob("*.mdx"):
+                if path.is_file():
+                    sha, size = self._sha(path)
+                    files.append(doc_file_info(path.relative_to(self.root).as_posix(), sha, size))
+        # Forget hashes of deleted files
+        live = {self.root / f["path"] for f in files}
+        for path in [path for path in list(self._hashes) if path not in live]:
+            self._hashes.pop(path, None)
+        return sorted(files, key=lambda f: f["path"])
+
+    def _list(self, subpath: str) -> List[Dict[str, Any]]:
+        directory = self._resolve(f"{DOCS_PATH}/{subpath}".rstrip("/"))
+        if directory is None or not directory.is_dir():
+            return []
+        entries = []
+        for path in sorted(directory.iterdir()):
+            repository_path = path.relative_to(self.root).as_posix()
+            if path.is_dir():
+                entries.append({"name": path.name, "path": repository_path, "type": "dir"})
+            elif path.is_file():
+                sha, size = self._sha(path)
+                entries.append(
+                    {"name": path.name, "path": repository_path, "type": "file", "sha": sha, "size": size}
+                )
+        return entries
+
+    def _read(self, path: str) -> Optional[str]:
+        resolved = self._resolve(path)
+        if resolved is None:
+            return None
+        try:
+            return resolved.read_text(encoding="utf-8")
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    async def get_all_doc_files(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._scan)
+
+    async def list_docs_files(self, subpath: str = "") -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._list, subpath)
+
+    async def fetch_file_content(self, path: str, sha: Optional[str] = None) -> Optional[str]:
+        return await asyncio.to_thread(self._read, path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "files_tracked": len(self._hashes),
+            "hashed": self.hashed,
+        }
@@ -0,0 +1,160 @@
+"""Byte-budgeted in-memory LRU cache with expiry and per-namespace stats."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Key -> (value, size in bytes, expiry as a monotonic timestamp or None)
+_Entry = Tuple[Any, int, Optional[float]]
+
+
+class MemoryCache:
+    """
+    LRU cache bounded by the total size of its values rather than a count.
+
+    Keys live in namespaces (e.g. ``"file"`` and ``"list"``) that share the
+    byte budget but keep separate statistics. Expired entries are dropped
+    when they are looked up, and a sweep over all entries runs at most every
+    ``sweep_interval`` seconds from within ``get``/``put``, so entries nobody
+    asks for again do not linger either. A lock makes one instance safe to
+    share between services and threads.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        sweep_interval: float = 60.0,
+    ):
+        """
+        Args:
+            max_bytes: Total size of cached values above which least
+                recently used entries are evicted
+            ttl: Default seconds after which an entry expires, or None to
+                keep entries until they are evicted
+            sweep_interval: Minimum seconds between two expiry sweeps
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _namespace_stats(self, namespace: str) -> Dict[str, int]:
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                "entries": 0,
+                "bytes": 0,
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "expirations": 0,
+            }
+        return self._stats[namespace]
+
+    def _remove(self, key: Tuple[str, Hashable], reason: Optional[str] = None):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        stats = self._namespace_stats(key[0])
+        stats["entries"] -= 1
+        stats["bytes"] -= size
+        if reason:
+            stats[reason] += 1
+
+    def _sweep(self, now: float):
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        expired = [
+            key
+            for key, (_, _, expires_at) in self._entries.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key, "expirations")
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            stats = self._namespace_stats(namespace)
+            entry = self._entries.get((namespace, key))
+            if entry is not None and entry[2] is not None and entry[2] <= now:
+                self._remove((namespace, key), "expirations")
+                entry = None
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            stats["hits"] += 1
+            return entry[0]
+
+    def put(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        size: int,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Store a value, evicting least recently used entries to fit the budget.
+
+        Args:
+            namespace: Group the entry is accounted under
+            key: Key within the namespace
+            value: Value to cache
+            size: Approximate size of the value in bytes
+            ttl: Seconds until the entry expires; defaults to ``self.ttl``
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = now + ttl if ttl is not None else None
+            self._entries[(namespace, key)] = (value, size, expires_at)
+            self._bytes += size
+            stats = self._namespace_stats(namespace)
+            stats["entries"] += 1
+            stats["bytes"] += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)), "evictions")
+
+    def pop(self, namespace: str, key: Hashable):
+        """Drop an entry if it is cached."""
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            for namespace, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                namespaces[namespace] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                }
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "namespaces": namespaces,
+            }
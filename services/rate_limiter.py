@@ -0,0 +1,172 @@
+"""Scheduling of GitHub requests around the API's rate limits.
+
+Every response updates a per-host budget from ``X-RateLimit-Remaining`` and
+``X-RateLimit-Reset``. Requests wait while the budget is spent, and when
+GitHub answers 403/429 with ``Retry-After`` or an exhausted budget, the
+request is retried once the server says it may be.
+
+Requests have a priority taken from the ``request_priority`` context
+variable. Interactive requests (the default, e.g. ``get_doc_file``) may use
+the whole budget; background requests such as index builds stop while only
+``background_reserve`` requests are left and queue behind any waiting
+interactive request. Index builds set the variable for their task.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+# Wait without server guidance, e.g. for a secondary rate limit
+DEFAULT_RETRY_DELAY = 60.0
+
+
+class _Budget:
+    """What is known about the rate limit of one host."""
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.blocked_until = 0.0
+        self.waiting_interactive = 0
+
+
+class RateLimitScheduler:
+    """Paces requests per host so they stay within GitHub's rate limits."""
+
+    def __init__(
+        self,
+        background_reserve: int = 50,
+        max_retry_wait: float = 120.0,
+        max_retries: int = 3,
+    ):
+        """
+        Args:
+            background_reserve: Remaining requests kept for interactive use;
+                background requests wait for the reset below this
+            max_retry_wait: Longest delay a rate-limited request is retried
+                after; longer waits return the error response instead
+            max_retries: Retries of one request after rate-limit responses
+        """
+        self.background_reserve = background_reserve
+        self.max_retry_wait = max_retry_wait
+        self.max_retries = max_retries
+        self._budgets: Dict[str, _Budget] = {}
+        self.waits = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def _budget(self, host: str) -> _Budget:
+        if host not in self._budgets:
+            self._budgets[host] = _Budget()
+        return self._budgets[host]
+
+    def _delay(self, budget: _Budget, priority: int) -> float:
+        """Seconds a request of ``priority`` has to wait, 0 if it may go now."""
+        now = time.time()
+        if budget.reset_at is not None and now >= budget.reset_at:
+            # A new window started; the next response tells the new budget
+            budget.remaining = budget.reset_at = None
+        delay = max(0.0, budget.blocked_until - now)
+        if budget.remaining is not None:
+            floor = self.background_reserve if priority == BACKGROUND else 0
+            if budget.remaining <= floor:
+                delay = max(delay, (budget.reset_at or now + DEFAULT_RETRY_DELAY) - now)
+        return delay
+
+    async def acquire(self, host: str, priority: Optional[int] = None):
+        """Wait until a request to ``host`` fits the budget, then count it."""
+        if priority is None:
+            priority = request_priority.get()
+        budget = self._budget(host)
+        interactive = priority == INTERACTIVE
+        if interactive:
+            budget.waiting_interactive += 1
+        try:
+            while True:
+                delay = self._delay(budget, priority)
+                if delay <= 0 and (interactive or not budget.waiting_interactive):
+                    break
+                self.waits += 1
+                # Re-check regularly: responses may reveal a reset or more budget
+                await asyncio.sleep(min(max(delay, 0.05), 5.0))
+        finally:
+            if interactive:
+                budget.waiting_interactive -= 1
+        if budget.remaining is not None:
+            budget.remaining -= 1
+
+    def update(self, host: str, status: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Record the rate-limit headers of a response.
+
+        Returns:
+            Seconds after which to retry if the response was rejected by the
+            rate limit, otherwise None
+        """
+        budget = self._budget(host)
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                budget.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                budget.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                budget.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+        retry_after = self._retry_after(headers.get("Retry-After"))
+        limited = status == 429 or (
+            status == 403 and (retry_after is not None or budget.remaining == 0)
+        )
+        if not limited:
+            return None
+
+        self.rate_limited += 1
+        now = time.time()
+        if retry_after is None:
+            retry_after = (
+                budget.reset_at - now
+                if budget.remaining == 0 and budget.reset_at is not None
+                else DEFAULT_RETRY_DELAY
+            )
+        retry_after = max(0.0, retry_after)
+        budget.blocked_until = max(budget.blocked_until, now + retry_after)
+        return retry_after
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse Retry-After given in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hosts": {
+                host: {
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_at": budget.reset_at,
+                    "blocked_for": round(max(0.0, budget.blocked_until - time.time()), 1),
+                }
+                for host, budget in self._budgets.items()
+            },
+            "waits": self.waits,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+        }
@@ -0,0 +1,84 @@
+"""LRU cache of formatted search responses, scoped to one index generation."""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .embedding_cache import normalize_query
+
+
+def response_key(query: str, **params: Any) -> Tuple[str, str]:
+    """
+    Build a cache key from a query and every parameter that shapes the response.
+
+    Filter values may be lists, so parameters are serialized rather than hashed.
+    """
+    return normalize_query(query), json.dumps(params, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    """
+    Bounded LRU of search responses.
+
+    Entries belong to the index generation they were computed from. Looking
+    up a key for a different generation drops everything first, so a swapped
+    in rebuild never serves results of the index it replaced.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Args:
+            max_entries: Maximum number of responses kept; 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self.generation: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _switch(self, generation: Optional[str]):
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, generation: Optional[str], key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key computed from ``generation``."""
+        self._switch(generation)
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, generation: Optional[str], key: Hashable, response: Dict[str, Any]):
+        """Store a response computed from ``generation``."""
+        if self.max_entries <= 0:
+            return
+        self._switch(generation)
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
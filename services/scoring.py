@@ -0,0 +1,177 @@
+"""Vectorized cosine-similarity scoring over an embedding matrix."""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of ``matrix`` with every row scaled to unit length."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class ScoringEngine:
+    """Scores every chunk against a query with a single matrix-vector product."""
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False):
+        """
+        Args:
+            embeddings: Matrix of shape (chunks, dimension)
+            normalized: Whether rows are already unit length. If so the matrix
+                is used as-is (including memory-mapped arrays) without a copy.
+        """
+        if normalized and embeddings.dtype == np.float32:
+            self.matrix = embeddings
+        else:
+            self.matrix = normalize_rows(embeddings)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1]
+
+    def top_k(
+        self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the ``k`` rows most similar to ``query``.
+
+        Args:
+            query: Query embedding of shape (dimension,)
+            k: Number of results to return
+            rows: Optional sorted row ids to restrict scoring to
+
+        Returns:
+            Tuple of (row ids, cosine scores), best match first
+        """
+        return self.top_k_many(np.asarray(query)[np.newaxis, :], k, rows)[0]
+
+    def top_k_many(
+        self, queries: np.ndarray, k: int, rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the ``k`` best rows for each of several queries with one
+        matrix-matrix product.
+
+        Args:
+            queries: Query embeddings of shape (queries, dimension)
+            k: Number of results per query
+            rows: Optional sorted row ids to restrict scoring to
+
+        Returns:
+            One (row ids, cosine scores) tuple per query, best match first
+        """
+        queries = normalize_rows(queries)
+
+        if rows is None:
+            scores = queries @ self.matrix.T
+        elif len(rows) * 5 > len(self):
+            # Gathering a row costs about five times as much as scoring it in place
+            scores = (queries @ self.matrix.T)[:, rows]
+        else:
+            scores = queries @ self.matrix[rows].T
+
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            return [empty] * len(queries)
+
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        row_ids = candidates if rows is None else rows[candidates]
+        return list(zip(row_ids, candidate_scores))
+
+
+class CompactMatrix:
+    """
+    Truncated, int8-quantized copy of the embedding matrix for coarse scoring.
+
+    ``text-embedding-3`` vectors keep most of their ranking quality when cut
+    to their leading dimensions (Matryoshka representation), so scoring the
+    first 256 dimensions at one byte each reads 24x less memory than the
+    full float32 matrix. Candidates are then rescored at full precision.
+    """
+
+    # Rows converted back to float32 per block; small enough to stay in cache
+    BLOCK_SIZE = 1024
+
+    def __init__(self, codes: np.ndarray):
+        """
+        Args:
+            codes: int8 matrix of shape (chunks, compact dimension)
+        """
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        return self.codes.shape[1]
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, dimension: int = 256) -> "CompactMatrix":
+        """Truncate rows to ``dimension``, renormalize and quantize to int8."""
+        dimension = min(dimension, matrix.shape[1])
+        codes = np.empty((matrix.shape[0], dimension), dtype=np.int8)
+        for start in range(0, matrix.shape[0], cls.BLOCK_SIZE):
+            block = normalize_rows(matrix[start : start + cls.BLOCK_SIZE, :dimension])
+            # Unit vectors have components in [-1, 1]; one scale keeps the
+            # ranking intact because it multiplies every score equally
+            codes[start : start + len(block)] = np.round(block * 127)
+        return cls(codes)
+
+    def scores(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Approximate similarity of each query to each (selected) row.
+
+        Returns:
+            Matrix of shape (queries, rows), proportional to cosine similarity
+        """
+        queries = normalize_rows(queries[:, : self.dimension]).T
+        codes = self.codes if rows is None else self.codes[rows]
+        scores = np.empty((queries.shape[1], len(codes)), dtype=np.float32)
+        buffer = np.empty((self.BLOCK_SIZE, self.dimension), dtype=np.float32)
+        for start in range(0, len(codes), self.BLOCK_SIZE):
+            block = buffer[: len(codes[start : start + self.BLOCK_SIZE])]
+            block[...] = codes[start : start + self.BLOCK_SIZE]
+            scores[:, start : start + len(block)] = (block @ queries).T
+        return scores
+
+    def candidates(
+        self, queries: np.ndarray, n: int, rows: Optional[np.ndarray] = None
+    ) -> List[np.ndarray]:
+        """
+        Pick the ``n`` best rows per query by compact score.
+
+        Returns:
+            One array of sorted candidate row ids per query
+        """
+        scores = self.scores(queries, rows)
+        n = min(n, scores.shape[1])
+        if n < scores.shape[1]:
+            top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        if rows is not None:
+            top = rows[top]
+        return [np.sort(candidate_rows) for candidate_rows in top]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"codes": self.codes}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CompactMatrix":
+        return cls(arrays["codes"])
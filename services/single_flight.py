@@ -0,0 +1,69 @@
+"""Coalescing of concurrent identical calls into one."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key starts the call; everyone arriving while it
+    is in flight awaits the same task and gets the same result or exception.
+    The key is forgotten as soon as the call finishes, so later callers
+    start a new one (results are cached elsewhere, not here).
+
+    A waiter that is cancelled does not cancel the shared call. Calls are
+    tracked per event loop, as tasks cannot be awaited across loops.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for ``key`` is running on the current event loop."""
+        return (asyncio.get_running_loop(), key) in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> "asyncio.Future[T]":
+        """
+        Start ``fn()``, or join the call already running for ``key``.
+
+        The call is registered before this returns, so callers that check
+        ``in_flight`` or call ``do`` right after see it even before awaiting.
+
+        Args:
+            key: Identifies calls that are interchangeable
+            fn: Starts the call; only invoked if none is in flight
+
+        Returns:
+            Awaitable with the call's result
+        """
+        flight_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(flight_key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[flight_key] = task
+
+            def forget(finished: "asyncio.Future[Any]"):
+                if self._calls.get(flight_key) is finished:
+                    del self._calls[flight_key]
+                # Mark the outcome as seen in case every waiter was cancelled
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(forget)
+        else:
+            self.coalesced += 1
+        return asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
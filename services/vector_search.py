@@ -6,15 +6,33 @@ import os
 
 # Import MDX parser components
 import sys
-from datetime import datetime, timedelta
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
-from openai import AsyncOpenAI
 
+from .docs_source import DocsSource
 from .github_client import GitHubDocsClient
+from .rate_limiter import BACKGROUND, request_priority
+from .ann_index import IVFIndex
+from .bm25_index import BM25Index, is_identifier_query, reciprocal_rank_fusion
+from .embedding_cache import EmbeddingCache, normalize_query
+from .embedding_providers import (
+    DEFAULT_OPENAI_MODEL,
+    EmbeddingProvider,
+    LocalEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+)
+from .embedding_scheduler import EmbeddingScheduler
+from .embedding_store import EmbeddingStore, content_key
+from .filters import FilterValue
+from .index_snapshot import IndexSnapshot
+from .index_store import GenerationStore, IndexFormatError
+from .response_cache import ResponseCache, response_key
+from .scoring import CompactMatrix, normalize_rows
+from .single_flight import SingleFlight
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.mdx_parser import MDXParser, SemanticChunker
@@ -23,24 +41,96 @@ from utils.mdx_parser import MDXParser, SemanticChunker
 class VectorSearch:
     """Simple vector search following OpenAI guidelines."""
 
-    def __init__(self, data_dir: str = "./vector_data"):
+    def __init__(
+        self,
+        data_dir: str = "./vector_data",
+        embedding_concurrency: int = 4,
+        fetch_concurrency: int = 8,
+        archive_min_files: Optional[int] = 50,
+        query_cache_size: int = 1024,
+        query_cache_ttl: Optional[float] = None,
+        persist_query_cache: bool = True,
+        response_cache_size: int = 512,
+        ann_min_rows: Optional[int] = 100_000,
+        ann_nprobe: int = 8,
+        compact_min_rows: Optional[int] = 10_000,
+        compact_dimension: int = 256,
+        rerank_candidates: int = 200,
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        local_fallback: bool = True,
+        embedding_store_bytes: int = 512 * 1024 * 1024,
+        docs_source: Optional[DocsSource] = None,
+        poll_interval: Optional[float] = 300.0,
+    ):
+        """
+        Args:
+            fetch_concurrency: Documentation files downloaded at once during a build
+            archive_min_files: Changed files from which a build downloads the
+                repository tarball instead of fetching files one by one;
+                None always fetches per file
+            response_cache_size: Search responses kept per index generation
+            embedding_provider: Embedding backend; defaults to OpenAI when
+                OPENAI_API_KEY is set and to the local provider otherwise
+            local_fallback: Build with the local provider when the primary one
+                fails and there is no index to serve at all
+            embedding_store_bytes: Size per model above which chunk vectors no
+                index generation uses are garbage collected
+            docs_source: Where documentation is read from, shared with other
+                services; defaults to a private GitHub client caching under
+                ``data_dir``
+            poll_interval: Seconds between checks of the source's revision
+                against the one the index was built from; a difference
+                triggers an incremental rebuild. None only checks on
+                ``initialize``
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
-        # OpenAI setup
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.model = "text-embedding-3-small"
+        # Embedding setup
+        if embedding_provider is None:
+            if os.getenv("OPENAI_API_KEY"):
+                embedding_provider = OpenAIEmbeddingProvider()
+            else:
+                print("⚠️ OPENAI_API_KEY not set, using local embeddings")
+                embedding_provider = LocalEmbeddingProvider()
+        self.provider = embedding_provider
+        self.fallback_provider: Optional[EmbeddingProvider] = None
+        if local_fallback and not isinstance(embedding_provider, LocalEmbeddingProvider):
+            self.fallback_provider = LocalEmbeddingProvider()
+        self.embedding_concurrency = embedding_concurrency
+        self.fetch_concurrency = fetch_concurrency
+        self.archive_min_files = archive_min_files
+        self.embedding_store = EmbeddingStore(
+            self.data_dir / "embedding_store", max_bytes=embedding_store_bytes
+        )
+        self.query_cache = EmbeddingCache(
+            max_entries=query_cache_size,
+            ttl=query_cache_ttl,
+            path=self.data_dir / "query_embeddings.jsonl"
+            if persist_query_cache
+            else None,
+        )
+        self.response_cache = ResponseCache(max_entries=response_cache_size)
+        # Concurrent initializations and identical query embeddings run once
+        self._flights = SingleFlight()
 
-        # Data
-        self.df: Optional[pd.DataFrame] = None
-        self.github_client = GitHubDocsClient()
+        # Data: each build is a generation; searches read the live snapshot
+        self.generations = GenerationStore(self.data_dir)
+        self._snapshot: Optional[IndexSnapshot] = None
+        self.ann_min_rows = ann_min_rows
+        self.ann_nprobe = ann_nprobe
+        self.compact_min_rows = compact_min_rows
+        self.compact_dimension = compact_dimension
+        self.rerank_candidates = rerank_candidates
+        self.docs_source = docs_source or GitHubDocsClient(
+            cache_dir=str(self.data_dir / "github_cache")
+        )
+        self.poll_interval = poll_interval
 
         # State
-        self._ready = False
         self._indexing_task: Optional[asyncio.Task] = None
+        self._indexing_full = False
+        self._poll_task: Optional[asyncio.Task] = None
 
         # Parsers and chunkers
         self.mdx_parser = MDXParser()
@@ -50,212 +140,897 @@ class VectorSearch:
             overlap_size=50,  # words
         )
 
+    @property
+    def model(self) -> str:
+        """Model id of the primary embedding provider."""
+        return self.provider.model
+
+    def _provider_for(self, model: Optional[str]) -> EmbeddingProvider:
+        """Find the provider that produced vectors for ``model``."""
+        if model is None or model == self.provider.model:
+            return self.provider
+        if self.fallback_provider is not None and model == self.fallback_provider.model:
+            return self.fallback_provider
+        raise ValueError(f"No embedding provider for model {model}")
+
+    @property
+    def _ready(self) -> bool:
+        """Whether a generation is loaded; stays true while a rebuild runs."""
+        return self._snapshot is not None
+
     async def initialize(self):
-        """Initialize the search service."""
+        """
+        Initialize the search service.
+
+        An existing index is loaded and served even when it is stale; the
+        rebuild then runs in the background and is swapped in when done.
+        Concurrent calls share one initialization.
+        """
+        self._resume_background()
+        await self._flights.do("initialize", self._initialize)
+
+    async def _initialize(self):
         try:
-            csv_path = self.data_dir / "embeddings.csv"
+            # Legacy indexes were always built with the default OpenAI model
+            adopted = self.generations.adopt_legacy(DEFAULT_OPENAI_MODEL)
+            if adopted:
+                print(f"📦 {adopted}")
 
-            if csv_path.exists() and not await self._should_rebuild():
+            generation = self.generations.current_id()
+            if self._snapshot is None and generation is not None:
                 print("📚 Loading existing embeddings...")
-                await self._load_embeddings()
-                self._ready = True
-                print(f"✅ Loaded {len(self.df)} document chunks")
-            else:
+                self._snapshot = await self._load_snapshot(generation)
+                print(f"✅ Loaded {len(self._snapshot.df)} document chunks")
+
+            if self._snapshot is None or await self._should_rebuild():
                 print("🏗️ Building new embeddings...")
                 await self.start_background_indexing()
 
+            if self.poll_interval is not None and not self._running(self._poll_task):
+                self._poll_task = asyncio.create_task(self._poll_revision())
+
         except Exception as e:
             print(f"⚠️ Error initializing: {e}")
             await self.start_background_indexing()
 
-    async def start_background_indexing(self):
-        """Start background indexing."""
-        if self._indexing_task is None or self._indexing_task.done():
-            self._indexing_task = asyncio.create_task(self._build_embeddings())
+    async def start_background_indexing(self, full: bool = False):
+        """
+        Start background indexing.
+
+        Args:
+            full: Re-embed every document instead of only the changed ones
+        """
+        if not self._running(self._indexing_task):
+            self._indexing_task = asyncio.create_task(self._build_embeddings(full))
+            self._indexing_full = full
+
+    @staticmethod
+    def _running(task: Optional[asyncio.Task]) -> bool:
+        """
+        Check whether a background task is still making progress.
 
-    async def _build_embeddings(self):
-        """Build embeddings following OpenAI guidelines."""
+        A task whose event loop stopped never finishes. This happens to tasks
+        started from a short-lived loop, such as one used only to initialize,
+        so they count as gone.
+        """
+        return task is not None and not task.done() and task.get_loop().is_running()
+
+    def _resume_background(self):
+        """Restart a build or the revision poller left behind on a stopped loop."""
+        task = self._indexing_task
+        if task is not None and not task.done() and not self._running(task):
+            print("🔁 Restarting an interrupted index build")
+            self._indexing_task = asyncio.create_task(self._build_embeddings(self._indexing_full))
+        if self._poll_task is not None and not self._running(self._poll_task):
+            self._poll_task = asyncio.create_task(self._poll_revision())
+
+    async def _poll_revision(self):
+        """Rebuild incrementally whenever the source reports a new revision."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._running(self._indexing_task) and await self._should_rebuild():
+                print("👀 Documentation changed upstream, updating the index")
+                await self.start_background_indexing()
+
+    @property
+    def _chunker_config(self) -> Dict[str, int]:
+        return {
+            "target_chunk_size": self.semantic_chunker.target_chunk_size,
+            "max_chunk_size": self.semantic_chunker.max_chunk_size,
+            "overlap_size": self.semantic_chunker.overlap_size,
+        }
+
+    async def _build_embeddings(self, full: bool = False):
+        """
+        Build embeddings following OpenAI guidelines.
+
+        Only files whose blob SHA differs from the index manifest are fetched,
+        chunked and embedded; rows of deleted files are dropped. A full build
+        happens when there is no usable index or ``full`` is set.
+
+        The result is written to a new generation, read back and checked,
+        and only then published and swapped in. Until that point, and if the
+        build fails, searches keep using the previous snapshot.
+        """
+        generation = None
+        # Let interactive tool requests go first when the rate limit is tight
+        priority = request_priority.set(BACKGROUND)
         try:
             print("🔄 Fetching documentation...")
 
-            # Get all docs
-            files = await self.github_client.get_all_doc_files()
+            # Taken before listing: if the docs change in between, the next
+            # check sees a newer revision and picks up the difference
+            revision = await self._source_revision()
 
-            # Process into semantic chunks
-            chunks_data = []
-            for file_info in files:
-                try:
-                    content = await self.github_client.fetch_file_content(
-                        file_info["path"]
-                    )
-                    if content:
-                        # Parse MDX document
-                        document = self.mdx_parser.parse(
-                            content, file_info["relative_path"]
-                        )
+            # Get all docs with their blob SHAs
+            files = await self.docs_source.get_all_doc_files()
+            if not files:
+                raise RuntimeError("No documentation files found, keeping the index")
+            current_shas = {f["relative_path"]: f.get("sha") for f in files}
+
+            # Diff against the indexed files, or start over for a full build
+            baseline = await self._load_baseline()
+            incremental = baseline is not None and not full
+            previous_files = baseline.indexed_files if incremental else {}
+            changed_files = [
+                f
+                for f in files
+                if not f.get("sha")
+                or previous_files.get(f["relative_path"]) != f["sha"]
+            ]
+            deleted_paths = set(previous_files) - set(current_shas)
+
+            if not changed_files and not deleted_paths:
+                print("✅ Documentation unchanged, index is up to date")
+                self._record_revision(revision)
+                return
+
+            print(
+                f"📝 {len(changed_files)} changed and {len(deleted_paths)} deleted "
+                f"of {len(files)} documents"
+            )
+
+            # Fetch, chunk and embed changed files as overlapping stages
+            provider = self.provider
+            added_before = self.embedding_store.added
+            chunks_data, failed_paths, embed_error = await self._chunk_files(
+                changed_files, provider
+            )
+            print(
+                f"📊 Created {len(chunks_data)} chunks from "
+                f"{len(changed_files) - len(failed_paths)} documents"
+            )
+
+            # Collect the vectors; only chunks the pipeline missed are embedded here
+            new_df = pd.DataFrame(chunks_data)
+            texts = new_df["combined"].tolist() if len(new_df) else []
+            try:
+                if embed_error is not None:
+                    raise embed_error
+                new_matrix, content_keys = await self._embed_texts(texts, provider)
+            except Exception as e:
+                # With nothing to serve, a local index beats no index at all
+                if incremental or self._snapshot is not None or not self.fallback_provider:
+                    raise
+                provider = self.fallback_provider
+                print(f"⚠️ {self.model} unavailable ({e}), building with {provider.model}")
+                new_matrix, content_keys = await self._embed_texts(texts, provider)
+            if len(new_df):
+                new_df["content_hash"] = content_keys
+                unique_texts = len(set(content_keys))
+                embedded = min(unique_texts, self.embedding_store.added - added_before)
+                print(
+                    f"♻️ Reused stored embeddings for {unique_texts - embedded} "
+                    f"of {unique_texts} unique chunk texts"
+                )
+
+            # Keep rows of untouched files (and of files we failed to refetch)
+            replaced_paths = (
+                {f["relative_path"] for f in changed_files} - failed_paths
+            ) | deleted_paths
+            if incremental and len(baseline.df):
+                keep = ~baseline.df["path"].isin(replaced_paths).to_numpy()
+                df = pd.concat([baseline.df[keep], new_df], ignore_index=True)
+                matrix = np.vstack([baseline.matrix[keep], new_matrix])
+            else:
+                df = new_df.reset_index(drop=True)
+                matrix = new_matrix
+
+            # Record the SHA of every file whose rows are now current
+            indexed_files = {
+                path: sha
+                for path, sha in current_shas.items()
+                if sha and path not in failed_paths
+            }
+            for path in failed_paths & set(previous_files):
+                indexed_files[path] = previous_files[path]
 
-                        # Create semantic chunks
-                        file_chunks = self.semantic_chunker.chunk_document(
-                            document, file_info["relative_path"]
-                        )
+            # Cluster large indexes for approximate search
+            ann = await self._build_ann(matrix, baseline.ann if incremental else None)
 
-                        # Add to chunks data
-                        chunks_data.extend(file_chunks)
+            # Keep a truncated int8 copy for two-stage search
+            compact = await self._build_compact(matrix)
+
+            # Build the lexical index over the same chunks
+            lexical = await asyncio.to_thread(BM25Index.build, df["combined"].tolist())
+
+            # Save binary index with unit-length rows so loads need no copy
+            generation, store = self.generations.create()
+            await asyncio.to_thread(
+                store.save,
+                df,
+                matrix,
+                provider.model,
+                extra={
+                    "normalized": True,
+                    "chunker": self._chunker_config,
+                    "files": indexed_files,
+                    # Left unset while files failed, so the next check retries them
+                    "revision": None if failed_paths else revision,
+                },
+                artifacts={
+                    "bm25": lexical.to_arrays(),
+                    **({"ivf": ann.to_arrays()} if ann is not None else {}),
+                    **({"compact": compact.to_arrays()} if compact is not None else {}),
+                },
+            )
 
-                        print(
-                            f"📄 {file_info['name']}: {len(file_chunks)} semantic chunks"
-                        )
+            # Read the generation back the way a restart would, then check it
+            snapshot = await self._load_snapshot(generation)
+            await asyncio.to_thread(self._validate_snapshot, snapshot, len(df))
 
+            # Publish on disk, then swap the in-memory reference in one step
+            await asyncio.to_thread(self.generations.publish, generation)
+            self._snapshot = snapshot
+
+            # Drop stored chunk vectors no remaining generation uses
+            freed = await asyncio.to_thread(self._collect_embeddings)
+            if freed:
+                print(f"🧹 Freed {freed / 1e6:.1f} MB of unused embeddings")
+
+            print(
+                f"✅ Embeddings complete! Saved {len(df)} chunks to generation "
+                f"{generation}"
+            )
+
+        except Exception as e:
+            if self._snapshot is not None:
+                print(f"❌ Embedding generation failed, still serving the previous index: {e}")
+            else:
+                print(f"❌ Embedding generation failed: {e}")
+            logging.error(f"Embedding error: {e}", exc_info=True)
+            if generation is not None and generation != self.generations.current_id():
+                self.generations.discard(generation)
+        finally:
+            request_priority.reset(priority)
+
+    async def _load_baseline(self) -> Optional[IndexSnapshot]:
+        """
+        Find the index to diff a rebuild against.
+
+        The live snapshot is used when there is one; otherwise the published
+        generation is loaded and, since it is the best available, served.
+
+        Returns:
+            The baseline if it was built with the same model and chunker
+        """
+        snapshot = self._snapshot
+        generation = self.generations.current_id()
+        if snapshot is None and generation is not None:
+            try:
+                snapshot = await self._load_snapshot(generation)
+            except ValueError as e:
+                print(f"⚠️ Ignoring existing index: {e}")
+                return None
+            self._snapshot = snapshot
+
+        if (
+            snapshot is not None
+            and snapshot.manifest.get("model") == self.model
+            and snapshot.manifest.get("chunker") == self._chunker_config
+        ):
+            return snapshot
+        return None
+
+    async def _chunk_files(
+        self, files: List[Dict[str, Any]], provider: EmbeddingProvider
+    ) -> Tuple[List[Dict[str, Any]], Set[str], Optional[Exception]]:
+        """
+        Fetch, parse and chunk documentation files, embedding chunks on the way.
+
+        The stages run concurrently and are connected by bounded queues:
+        ``fetch_concurrency`` downloads (or one streamed repository tarball
+        when at least ``archive_min_files`` files changed) feed a parser
+        thread, and chunks go
+        to the embedding API as soon as a batch is ready instead of after the
+        last file. Vectors land in the embedding store, so ``_embed_texts``
+        afterwards only reads them back. A failed embedding request stops
+        further embedding but not chunking, and is returned rather than
+        raised so the caller can fall back to another provider.
+
+        Returns:
+            Tuple of (chunks in file order, relative paths that could not be
+            processed, embedding error if any)
+        """
+        file_queue: asyncio.Queue = asyncio.Queue()
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self.fetch_concurrency * 2)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.fetch_concurrency * 2)
+
+        chunks_by_path: Dict[str, List[Dict[str, Any]]] = {}
+        failed_paths: Set[str] = set()
+        embed_error: Optional[Exception] = None
+
+        async def fetch():
+            while not file_queue.empty():
+                file_info = file_queue.get_nowait()
+                try:
+                    content = await self.docs_source.fetch_file_content(
+                        file_info["path"], sha=file_info.get("sha")
+                    )
+                except Exception as e:
+                    print(f"⚠️ Failed to fetch {file_info['path']}: {e}")
+                    content = None
+                if not content:
+                    failed_paths.add(file_info["relative_path"])
+                    continue
+                await parse_queue.put((file_info, content))
+
+        async def parse():
+            while (item := await parse_queue.get()) is not None:
+                file_info, content = item
+                try:
+                    # Parsing is CPU bound; a thread keeps downloads flowing
+                    file_chunks = await asyncio.to_thread(
+                        self._parse_and_chunk, content, file_info["relative_path"]
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to process {file_info['path']}: {e}")
+                    failed_paths.add(file_info["relative_path"])
                     continue
+                chunks_by_path[file_info["relative_path"]] = file_chunks
+                print(f"📄 {file_info['name']}: {len(file_chunks)} semantic chunks")
+                await embed_queue.put(file_chunks)
+            await embed_queue.put(None)
 
-            print(f"📊 Created {len(chunks_data)} chunks from {len(files)} documents")
+        async def embed():
+            scheduler = EmbeddingScheduler(
+                provider.embed_once, max_concurrency=self.embedding_concurrency
+            )
+            pending: Dict[str, str] = {}
+            requested: Set[str] = set()
+            requests: List[asyncio.Task] = []
 
-            # Create DataFrame
-            df = pd.DataFrame(chunks_data)
+            async def send(batch: Dict[str, str]):
+                nonlocal embed_error
+                try:
+                    vectors = await scheduler.embed(list(batch.values()))
+                except Exception as e:
+                    embed_error = embed_error or e
+                    return
+                self.embedding_store.put_many(
+                    list(batch), normalize_rows(vectors), provider.model
+                )
 
-            # Generate embeddings
-            print("🧮 Generating embeddings...")
-            embeddings = []
-            batch_size = 100
+            def flush():
+                if pending and embed_error is None:
+                    requests.append(asyncio.create_task(send(dict(pending))))
+                pending.clear()
 
-            for i in range(0, len(df), batch_size):
-                batch = df.iloc[i : i + batch_size]
-                batch_texts = batch["combined"].tolist()
+            while (file_chunks := await embed_queue.get()) is not None:
+                texts = {
+                    content_key(chunk["combined"], provider.model): chunk["combined"]
+                    for chunk in file_chunks
+                }
+                for key in self.embedding_store.missing(texts, provider.model):
+                    if key not in requested:
+                        requested.add(key)
+                        pending[key] = texts[key]
+                if len(pending) >= scheduler.max_batch_size:
+                    flush()
+            flush()
+            await asyncio.gather(*requests)
 
-                response = await self.client.embeddings.create(
-                    model=self.model, input=batch_texts
+        async def fetch_archive() -> Set[str]:
+            """Feed wanted files from the tarball; returns the paths received."""
+            wanted = {file_info["relative_path"]: file_info for file_info in files}
+            received: Set[str] = set()
+            try:
+                async for archived, content in self.docs_source.iter_archive_doc_files():
+                    file_info = wanted.get(archived["relative_path"])
+                    if file_info is None or not content:
+                        continue
+                    received.add(file_info["relative_path"])
+                    await parse_queue.put((file_info, content))
+            except Exception as e:
+                print(f"⚠️ Archive download failed ({e}), fetching files individually")
+            return received
+
+        async def fetch_all():
+            received: Set[str] = set()
+            if (
+                self.docs_source.bulk_download
+                and self.archive_min_files is not None
+                and len(files) >= self.archive_min_files
+            ):
+                received = await fetch_archive()
+            # Whatever the archive did not deliver is fetched file by file
+            remaining = [f for f in files if f["relative_path"] not in received]
+            for file_info in remaining:
+                file_queue.put_nowait(file_info)
+            await asyncio.gather(
+                *(fetch() for _ in range(min(self.fetch_concurrency, len(remaining))))
+            )
+            await parse_queue.put(None)
+
+        stages = [
+            asyncio.create_task(stage()) for stage in (fetch_all, parse, embed)
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for task in stages:
+                task.cancel()
+            raise
+
+        chunks_data = [
+            chunk
+            for file_info in files
+            for chunk in chunks_by_path.get(file_info["relative_path"], [])
+        ]
+        return chunks_data, failed_paths, embed_error
+
+    def _parse_and_chunk(self, content: str, relative_path: str) -> List[Dict[str, Any]]:
+        """Parse one MDX document into semantic chunks."""
+        document = self.mdx_parser.parse(content, relative_path)
+        return self.semantic_chunker.chunk_document(document, relative_path)
+
+    async def _embed_texts(
+        self, texts: List[str], provider: EmbeddingProvider
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Embed texts concurrently, reusing stored vectors for known texts.
+
+        Returns:
+            Tuple of (unit-length float32 rows, content key per text)
+        """
+        if not texts:
+            return np.empty((0, provider.dimension), dtype=np.float32), []
+
+        keys = [content_key(text, provider.model) for text in texts]
+        missing = self.embedding_store.missing(keys, provider.model)
+        if missing:
+            print(f"🧮 Generating embeddings for {len(missing)} texts...")
+            text_by_key = dict(zip(keys, texts))
+            scheduler = EmbeddingScheduler(
+                provider.embed_once, max_concurrency=self.embedding_concurrency
+            )
+            embeddings = await scheduler.embed([text_by_key[key] for key in missing])
+            self.embedding_store.put_many(
+                missing, normalize_rows(embeddings), provider.model
+            )
+        return self.embedding_store.get_many(keys, provider.model), keys
+
+    def _collect_embeddings(self) -> int:
+        """Garbage collect the embedding store against the kept generations."""
+        live_keys = set()
+        for generation in self.generations.list():
+            store = self.generations.store(generation)
+            if store.exists():
+                live_keys.update(
+                    key for key in store.read_column("content_hash") if isinstance(key, str)
                 )
+        return self.embedding_store.collect(live_keys)
 
-                batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
+    async def _load_snapshot(self, generation: str) -> IndexSnapshot:
+        """Open a generation's memory-mapped index as a searchable snapshot."""
+        # Parsing chunk metadata and building filters takes a while on large
+        # indexes; searches keep running on the live snapshot meanwhile
+        return await asyncio.to_thread(self._open_snapshot, generation)
 
-                print(f"   Embedded {i + len(batch)}/{len(df)} chunks...")
+    def _open_snapshot(self, generation: str) -> IndexSnapshot:
+        """Blocking part of ``_load_snapshot``."""
+        store = self.generations.store(generation)
+        df, embeddings, manifest = store.load()
 
-            # Add embeddings to DataFrame
-            df["embedding"] = embeddings
+        # Only serve vectors we can embed queries for
+        self._provider_for(manifest["model"])
 
-            # Save to CSV
-            csv_path = self.data_dir / "embeddings.csv"
-            df.to_csv(csv_path, index=False)
+        ivf_arrays = store.load_artifact("ivf", manifest)
+        bm25_arrays = store.load_artifact("bm25", manifest)
+        compact_arrays = store.load_artifact("compact", manifest)
+        if bm25_arrays:
+            lexical = BM25Index.from_arrays(bm25_arrays)
+        else:
+            # Indexes saved before BM25 existed get one built on load
+            lexical = BM25Index.build(df["combined"].tolist())
 
-            # Create timestamp file
-            timestamp_path = self.data_dir / ".last_build"
-            timestamp_path.touch()
+        print(f"📂 Loaded {len(df)} embeddings from {store.embeddings_path}")
+        return IndexSnapshot.create(
+            df,
+            embeddings,
+            normalized=manifest.get("normalized", False),
+            generation=generation,
+            manifest=manifest,
+            ann=IVFIndex.from_arrays(ivf_arrays) if ivf_arrays else None,
+            lexical=lexical,
+            compact=CompactMatrix.from_arrays(compact_arrays) if compact_arrays else None,
+        )
 
-            # Set data
-            self.df = df
-            self._ready = True
+    @staticmethod
+    def _validate_snapshot(snapshot: IndexSnapshot, expected_rows: int):
+        """
+        Reject a freshly built generation that should not replace the live one.
 
-            print(f"✅ Embeddings complete! Saved {len(df)} chunks to {csv_path}")
+        Raises:
+            IndexFormatError: If rows are missing or the vectors are unusable
+        """
+        if len(snapshot.df) != expected_rows or len(snapshot.engine) != expected_rows:
+            raise IndexFormatError(
+                f"New index has {len(snapshot.df)} rows, expected {expected_rows}"
+            )
+        if not expected_rows:
+            raise IndexFormatError("New index is empty")
+        if not np.isfinite(snapshot.matrix).all():
+            raise IndexFormatError("New index contains non-finite embeddings")
 
-        except Exception as e:
-            print(f"❌ Embedding generation failed: {e}")
-            logging.error(f"Embedding error: {e}", exc_info=True)
-            self._ready = False
+        # A stored row must find itself: catches misaligned or corrupt vectors
+        probe = np.asarray(snapshot.matrix[0])
+        _, scores = snapshot.engine.top_k(probe, 1)
+        if not len(scores) or scores[0] < 0.99 * float(probe @ probe):
+            raise IndexFormatError("New index failed the self-retrieval check")
+
+    async def _build_ann(
+        self, matrix: np.ndarray, previous: Optional[IVFIndex]
+    ) -> Optional[IVFIndex]:
+        """
+        Build an IVF index when the matrix is large enough to benefit.
 
-    async def _load_embeddings(self):
-        """Load embeddings from CSV."""
-        csv_path = self.data_dir / "embeddings.csv"
+        Incremental builds reuse the previous centroids and only reassign rows.
+        """
+        if self.ann_min_rows is None or len(matrix) < self.ann_min_rows:
+            return None
 
-        # Load DataFrame
-        df = pd.read_csv(csv_path)
+        centroids = None
+        if previous is not None and previous.centroids.shape[1] == matrix.shape[1]:
+            centroids = previous.centroids
 
-        # Convert embedding strings back to arrays
-        df["embedding"] = df["embedding"].apply(eval).apply(np.array)
+        print("🗂️ Building IVF index...")
+        # k-means is CPU bound; NumPy releases the GIL so the loop stays responsive
+        return await asyncio.to_thread(IVFIndex.build, matrix, centroids=centroids)
 
-        self.df = df
-        print(f"📂 Loaded {len(df)} embeddings from {csv_path}")
+    async def _build_compact(self, matrix: np.ndarray) -> Optional[CompactMatrix]:
+        """Build the coarse-scoring matrix when the index is large enough."""
+        if self.compact_min_rows is None or len(matrix) < self.compact_min_rows:
+            return None
+        return await asyncio.to_thread(
+            CompactMatrix.build, matrix, self.compact_dimension
+        )
+
+    @staticmethod
+    def _resolve_mode(snapshot: IndexSnapshot, query: str, mode: str) -> str:
+        """Pick the retrieval method for a query."""
+        if mode not in ("auto", "semantic", "lexical", "hybrid"):
+            raise ValueError(
+                f"mode must be 'auto', 'semantic', 'lexical' or 'hybrid', got {mode!r}"
+            )
+        if snapshot.lexical is None:
+            return "semantic"
+        if mode == "auto":
+            return "lexical" if is_identifier_query(query) else "hybrid"
+        return mode
+
+    def _top_k(
+        self,
+        snapshot: IndexSnapshot,
+        queries: np.ndarray,
+        limit: int,
+        rows: Optional[np.ndarray],
+        exact: bool = False,
+        nprobe: Optional[int] = None,
+    ) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], str]:
+        """
+        Score candidate rows for each query embedding.
+
+        With an IVF index, only rows in the ``nprobe`` closest lists are
+        scored. Otherwise, with a compact matrix, the truncated int8 vectors
+        pick ``rerank_candidates`` rows that are rescored at full precision.
+        A full exact scan is used when requested, when neither structure
+        exists, or when the filters leave fewer rows than they would score.
+
+        Returns:
+            Tuple of (one (row ids, scores) pair per query, search mode)
+        """
+        engine, ann, compact = snapshot.engine, snapshot.ann, snapshot.compact
+        if ann is not None and not exact:
+            nprobe = nprobe or self.ann_nprobe
+            if rows is None or len(rows) > ann.expected_candidates(nprobe):
+                mask = None
+                if rows is not None:
+                    mask = np.zeros(len(engine), dtype=bool)
+                    mask[rows] = True
+                ranked = []
+                for query in normalize_rows(queries):
+                    candidates = ann.candidates(query, nprobe, mask)
+                    ranked.append(engine.top_k(query, limit, candidates))
+                return ranked, "ivf"
+
+        if compact is not None and not exact:
+            n_candidates = max(self.rerank_candidates, limit)
+            if rows is None or len(rows) > n_candidates:
+                ranked = [
+                    engine.top_k(query, limit, candidates)
+                    for query, candidates in zip(
+                        queries, compact.candidates(queries, n_candidates, rows)
+                    )
+                ]
+                return ranked, "two_stage"
+
+        return engine.top_k_many(queries, limit, rows), "exact"
 
     async def _should_rebuild(self) -> bool:
-        """Check if embeddings should be rebuilt."""
-        timestamp_path = self.data_dir / ".last_build"
+        """
+        Check if embeddings should be rebuilt.
 
-        if not timestamp_path.exists():
+        They should when the index was built with another model (the
+        fallback provider, replaced when possible) or from another revision
+        of the docs than the source reports now. Indexes from before
+        revisions were recorded, or built while some files failed to
+        fetch, are rebuilt incrementally.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
             return True
+        if snapshot.manifest.get("model") != self.model:
+            return True
+
+        revision = await self._source_revision()
+        return revision is not None and revision != snapshot.manifest.get("revision")
+
+    async def _source_revision(self) -> Optional[str]:
+        """The source's current revision, or None if it cannot be checked."""
+        try:
+            return await self.docs_source.revision()
+        except Exception as e:
+            print(f"⚠️ Could not check the documentation revision: {e}")
+            return None
 
-        # Check if older than 24 hours
-        last_build = datetime.fromtimestamp(timestamp_path.stat().st_mtime)
-        return datetime.now() - last_build > timedelta(days=1)
+    def _record_revision(self, revision: Optional[str]):
+        """Mark the live index as built from ``revision`` when nothing changed."""
+        snapshot = self._snapshot
+        if (
+            revision is None
+            or snapshot is None
+            or snapshot.manifest.get("revision") == revision
+            or snapshot.generation != self.generations.current_id()
+        ):
+            return
+        manifest = self.generations.store(snapshot.generation).update_manifest(
+            revision=revision
+        )
+        self._snapshot = replace(snapshot, manifest=manifest)
+
+    async def get_embedding(self, text: str) -> np.ndarray:
+        """Get embedding for text following OpenAI guidelines, cached per query."""
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[np.ndarray]:
+        """
+        Embed several queries, sending all cache misses in one request.
 
-    async def get_embedding(self, text: str) -> List[float]:
-        """Get embedding for text following OpenAI guidelines."""
-        text = text.replace("\\n", " ")
-        response = await self.client.embeddings.create(input=[text], model=self.model)
-        return response.data[0].embedding
+        Args:
+            texts: Query texts
+            model: Embed with the provider for this model id; defaults to the
+                primary provider
+        """
+        provider = self._provider_for(model)
+        texts = [text.replace("\\n", " ") for text in texts]
+        embeddings = [self.query_cache.get(text, provider.model) for text in texts]
+
+        missing = list(
+            dict.fromkeys(
+                text for text, embedding in zip(texts, embeddings) if embedding is None
+            )
+        )
+        if missing:
+            # Texts another call is already embedding are awaited, not resent
+            flight_keys = {
+                text: ("embedding", provider.model, normalize_query(text)) for text in missing
+            }
+            new = [text for text in missing if not self._flights.in_flight(flight_keys[text])]
+            batch = asyncio.ensure_future(self._embed_queries(new, provider)) if new else None
+
+            async def vector_of(text: str) -> np.ndarray:
+                return (await batch)[text]
+
+            vectors = await asyncio.gather(
+                *(
+                    self._flights.do(flight_keys[text], lambda text=text: vector_of(text))
+                    for text in missing
+                )
+            )
+            fetched = dict(zip(missing, vectors))
+            embeddings = [
+                embedding if embedding is not None else fetched[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
 
-    def cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        return embeddings
+
+    async def _embed_queries(
+        self, texts: List[str], provider: EmbeddingProvider
+    ) -> Dict[str, np.ndarray]:
+        """Embed query texts in one request and add them to the query cache."""
+        vectors = await provider.embed(texts)
+        for text, vector in zip(texts, vectors):
+            self.query_cache.put(text, provider.model, vector)
+        return dict(zip(texts, vectors))
 
     async def search(
-        self, query: str, category: Optional[str] = None, limit: int = 10
+        self,
+        query: str,
+        category: FilterValue = None,
+        limit: int = 10,
+        chunk_type: FilterValue = None,
+        has_code_blocks: Optional[bool] = None,
+        heading_level: FilterValue = None,
+        path_prefix: FilterValue = None,
+        match: str = "all",
+        exact: bool = False,
+        nprobe: Optional[int] = None,
+        mode: str = "auto",
     ) -> Dict[str, Any]:
-        """Search using cosine similarity following OpenAI guidelines."""
-        if not self._ready or self.df is None:
+        """
+        Search using cosine similarity following OpenAI guidelines.
+
+        ``mode`` selects the retrieval method: "semantic" (embeddings only),
+        "lexical" (BM25 only, no embedding call), "hybrid" (reciprocal-rank
+        fusion of both) or "auto", which answers identifier-like queries such
+        as ``allow_delegation`` lexically and everything else with hybrid.
+
+        Metadata filters are resolved to row ids before scoring, so only
+        matching chunks are scored. Each filter takes a value or a list of
+        alternatives; ``match`` combines filters with AND ("all") or OR ("any").
+
+        Large indexes are searched approximately through the IVF index or in
+        two stages (see ``_top_k``); ``nprobe`` trades IVF latency for recall
+        and ``exact`` forces a full scan.
+
+        Responses are cached per index generation, so repeating a search
+        costs one dictionary lookup until the next rebuild is swapped in.
+        """
+        self._resume_background()
+        snapshot = self._snapshot
+        if snapshot is None:
             return {
                 "status": "indexing",
                 "message": "Embeddings are being built. Please try again in a moment.",
                 "results": [],
             }
 
+        cache_key = response_key(
+            query,
+            category=category,
+            limit=limit,
+            chunk_type=chunk_type,
+            has_code_blocks=has_code_blocks,
+            heading_level=heading_level,
+            path_prefix=path_prefix,
+            match=match,
+            exact=exact,
+            nprobe=nprobe,
+            mode=mode,
+        )
+        cached = self.response_cache.get(snapshot.generation, cache_key)
+        if cached is not None:
+            return {**cached, "query": query}
+
         try:
             print(f"🔍 Searching for: '{query}'")
 
-            # Get query embedding
-            query_embedding = np.array(await self.get_embedding(query))
-
-            # Calculate similarities
-            df = self.df.copy()
-            df["similarity"] = df["embedding"].apply(
-                lambda x: self.cosine_similarity(x, query_embedding)
+            # Restrict scoring to chunks matching the metadata filters
+            filters = self._collect_filters(
+                category, chunk_type, has_code_blocks, heading_level, path_prefix
             )
+            rows = snapshot.filters.rows(match=match, **filters)
 
-            # Filter by category if specified
-            if category:
-                df = df[df["category"] == category]
-
-            # Sort by similarity and get top results
-            results_df = df.sort_values("similarity", ascending=False).head(limit)
-
-            # Format results with enhanced metadata
-            results = []
-            for _, row in results_df.iterrows():
-                results.append(
-                    {
-                        "path": row["path"],
-                        "title": row["title"],
-                        "category": row["category"],
-                        "score": float(row["similarity"]),
-                        "snippet": row["content"][:200] + "..."
-                        if len(row["content"]) > 200
-                        else row["content"],
-                        "concepts": [],
-                        # Enhanced metadata from semantic chunking
-                        "chunk_type": row.get("chunk_type", "content"),
-                        "section_hierarchy": row.get("section_hierarchy", ""),
-                        "heading_level": row.get("heading_level", 0),
-                        "word_count": row.get("word_count", 0),
-                        "has_code_blocks": row.get("has_code_blocks", False),
-                        "has_special_components": row.get(
-                            "has_special_components", False
-                        ),
-                    }
-                )
+            [(results, retrieval, search_mode)] = await self._rank(
+                snapshot, [query], rows, limit, mode, exact, nprobe
+            )
 
             print(f"🔍 Found {len(results)} relevant documents")
 
-            return {
+            response = {
                 "status": "ready",
                 "query": query,
                 "category_filter": category,
+                "filters": filters,
+                "filter_match": match,
+                "mode": retrieval,
+                "search_mode": search_mode,
                 "total_found": len(results),
-                "total_docs": len(self.df["path"].unique())
-                if self.df is not None
-                else 0,
+                "total_docs": snapshot.total_docs,
                 "results": results,
             }
+            # Answers degraded by an embedding outage are not worth keeping
+            if retrieval != "lexical_fallback":
+                self.response_cache.put(snapshot.generation, cache_key, response)
+            return response
+
+        except Exception as e:
+            print(f"⚠️ Search error: {e}")
+            logging.error(f"Search error: {e}", exc_info=True)
+            return {
+                "status": "error",
+                "message": f"Search error: {str(e)}",
+                "results": [],
+            }
+
+    async def search_many(
+        self,
+        queries: List[str],
+        category: FilterValue = None,
+        limit: int = 10,
+        chunk_type: FilterValue = None,
+        has_code_blocks: Optional[bool] = None,
+        heading_level: FilterValue = None,
+        path_prefix: FilterValue = None,
+        match: str = "all",
+        exact: bool = False,
+        nprobe: Optional[int] = None,
+        mode: str = "auto",
+        deduplicate: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run several searches at once with shared filters.
+
+        All queries that need embeddings are embedded in a single request and
+        scored together with one matrix-matrix product. With ``deduplicate``,
+        a chunk already returned for an earlier query is skipped for later
+        ones. Other arguments behave as in ``search``.
+        """
+        self._resume_background()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                "status": "indexing",
+                "message": "Embeddings are being built. Please try again in a moment.",
+                "results": [],
+            }
+
+        try:
+            print(f"🔍 Searching for {len(queries)} queries")
+
+            filters = self._collect_filters(
+                category, chunk_type, has_code_blocks, heading_level, path_prefix
+            )
+            rows = snapshot.filters.rows(match=match, **filters)
+
+            ranked = await self._rank(
+                snapshot, queries, rows, limit, mode, exact, nprobe, deduplicate
+            )
+
+            return {
+                "status": "ready",
+                "total_queries": len(queries),
+                "filters": filters,
+                "filter_match": match,
+                "deduplicated": deduplicate,
+                "total_docs": snapshot.total_docs,
+                "results": [
+                    {
+                        "query": query,
+                        "mode": retrieval,
+                        "search_mode": search_mode,
+                        "total_found": len(results),
+                        "results": results,
+                    }
+                    for query, (results, retrieval, search_mode) in zip(
+                        queries, ranked
+                    )
+                ],
+            }
 
         except Exception as e:
             print(f"⚠️ Search error: {e}")
@@ -266,20 +1041,173 @@ class VectorSearch:
                 "results": [],
             }
 
+    @staticmethod
+    def _collect_filters(
+        category: FilterValue,
+        chunk_type: FilterValue,
+        has_code_blocks: Optional[bool],
+        heading_level: FilterValue,
+        path_prefix: FilterValue,
+    ) -> Dict[str, Any]:
+        """Drop unset filters so they can be passed to ``FilterIndex.rows``."""
+        return {
+            key: value
+            for key, value in (
+                ("category", category or None),
+                ("chunk_type", chunk_type),
+                ("has_code_blocks", has_code_blocks),
+                ("heading_level", heading_level),
+                ("path_prefix", path_prefix),
+            )
+            if value is not None
+        }
+
+    async def _rank(
+        self,
+        snapshot: IndexSnapshot,
+        queries: List[str],
+        rows: Optional[np.ndarray],
+        limit: int,
+        mode: str,
+        exact: bool,
+        nprobe: Optional[int],
+        deduplicate: bool = False,
+    ) -> List[Tuple[List[Dict[str, Any]], str, Optional[str]]]:
+        """
+        Rank chunks for each query.
+
+        Returns:
+            One (formatted results, retrieval mode, vector search mode) tuple
+            per query
+        """
+        retrievals = [self._resolve_mode(snapshot, query, mode) for query in queries]
+        pool = max(limit * 3, 30) if "hybrid" in retrievals else limit
+        if deduplicate:
+            pool += limit * (len(queries) - 1)
+
+        # Lexical matches need no network call
+        lexical: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for i, (query, retrieval) in enumerate(zip(queries, retrievals)):
+            if retrieval in ("lexical", "hybrid"):
+                lexical[i] = snapshot.lexical.top_k(query, pool, rows)
+                if retrieval == "lexical" and mode == "auto" and not len(lexical[i][0]):
+                    retrievals[i] = "semantic"
+
+        # Embed every query that needs vectors in one request and score them together
+        vector: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        search_mode = None
+        needs_vectors = [
+            i for i, retrieval in enumerate(retrievals) if retrieval != "lexical"
+        ]
+        embeddings = None
+        if needs_vectors:
+            try:
+                embeddings = await self.get_embeddings(
+                    [queries[i] for i in needs_vectors],
+                    model=snapshot.manifest.get("model"),
+                )
+            except Exception as e:
+                # Keep answering from BM25 while the embedding API is down
+                if snapshot.lexical is None or mode == "semantic":
+                    raise
+                logging.warning(f"Query embedding failed ({e}), answering lexically")
+                for i in needs_vectors:
+                    if i not in lexical:
+                        lexical[i] = snapshot.lexical.top_k(queries[i], pool, rows)
+                    retrievals[i] = "lexical_fallback"
+        if embeddings is not None:
+            ranked, search_mode = self._top_k(
+                snapshot, np.vstack(embeddings), pool, rows, exact=exact, nprobe=nprobe
+            )
+            vector = dict(zip(needs_vectors, ranked))
+
+        output = []
+        seen: Set[int] = set()
+        for i, retrieval in enumerate(retrievals):
+            if retrieval in ("lexical", "lexical_fallback"):
+                row_ids, scores = lexical[i]
+            elif retrieval == "semantic":
+                row_ids, scores = vector[i]
+            else:
+                row_ids, scores = reciprocal_rank_fusion([vector[i][0], lexical[i][0]])
+
+            results = []
+            for row_id, score in zip(row_ids.tolist(), scores.tolist()):
+                if len(results) >= limit:
+                    break
+                if deduplicate:
+                    if row_id in seen:
+                        continue
+                    seen.add(row_id)
+                results.append(self._format_result(snapshot.records[row_id], score))
+
+            vector_mode = search_mode if retrieval in ("semantic", "hybrid") else None
+            output.append((results, retrieval, vector_mode))
+        return output
+
+    def _format_result(self, row: Dict[str, Any], score: float) -> Dict[str, Any]:
+        """Format a chunk row as a search result with enhanced metadata."""
+        return {
+            "path": row["path"],
+            "title": row["title"],
+            "category": row["category"],
+            "score": float(score),
+            "snippet": row["content"][:200] + "..."
+            if len(row["content"]) > 200
+            else row["content"],
+            "concepts": [],
+            # Enhanced metadata from semantic chunking
+            "chunk_type": row.get("chunk_type", "content"),
+            "section_hierarchy": row.get("section_hierarchy", ""),
+            "heading_level": row.get("heading_level", 0),
+            "word_count": row.get("word_count", 0),
+            "has_code_blocks": row.get("has_code_blocks", False),
+            "has_special_components": row.get("has_special_components", False),
+        }
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status."""
-        if self._ready and self.df is not None:
-            return {
+        snapshot = self._snapshot
+        rebuilding = self._running(self._indexing_task)
+        if snapshot is not None:
+            status = {
                 "status": "ready",
-                "message": f"Embeddings ready with {len(self.df)} chunks from {len(self.df['path'].unique())} documents",
-                "total_chunks": len(self.df),
-                "total_docs": len(self.df["path"].unique()),
+                "message": f"Embeddings ready with {len(snapshot.df)} chunks from {snapshot.total_docs} documents",
+                "total_chunks": len(snapshot.df),
+                "total_docs": snapshot.total_docs,
                 "model": self.model,
+                "index_model": snapshot.manifest.get("model", self.model),
+                "generation": snapshot.generation,
+                "revision": snapshot.manifest.get("revision"),
+                "rebuilding": rebuilding,
+                "ann": {
+                    "type": "ivf",
+                    "n_lists": snapshot.ann.n_lists,
+                    "nprobe": self.ann_nprobe,
+                }
+                if snapshot.ann is not None
+                else None,
+                "two_stage": {
+                    "dimension": snapshot.compact.dimension,
+                    "rerank_candidates": self.rerank_candidates,
+                }
+                if snapshot.compact is not None
+                else None,
             }
-        elif self._indexing_task and not self._indexing_task.done():
-            return {
+        elif rebuilding:
+            status = {
                 "status": "indexing",
                 "message": "Building embeddings in background...",
             }
         else:
-            return {"status": "not_started", "message": "Embeddings not initialized"}
+            status = {"status": "not_started", "message": "Embeddings not initialized"}
+
+        status["query_cache"] = self.query_cache.stats()
+        status["response_cache"] = self.response_cache.stats()
+        status["embedding_store"] = self.embedding_store.stats()
+        status["docs_source"] = {
+            "type": type(self.docs_source).__name__,
+            "polling": self._running(self._poll_task),
+            **self.docs_source.stats(),
+        }
+        return status
@@ -0,0 +1,22 @@
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import pytest
+
+from services import github_client
+
+from .stand_in import GitHubStandIn
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """Start a GitHub stand-in and point the client's base URLs at it."""
+
+    @asynccontextmanager
+    async def serve(files: Dict[str, str], **kwargs):
+        async with GitHubStandIn(files, **kwargs) as stand_in:
+            monkeypatch.setattr(github_client, "GITHUB_API_BASE", stand_in.url)
+            monkeypatch.setattr(github_client, "GITHUB_RAW_BASE", stand_in.url)
+            yield stand_in
+
+    return serve
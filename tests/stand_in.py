@@ -0,0 +1,230 @@
+"""Local stand-in for the GitHub API and raw.githubusercontent.com.
+
+Serves a small repository from a dict of path -> content: contents
+listings, Git trees, the branch tarball and raw files, with ETags so
+conditional requests get 304s. Every request path is recorded in
+``requests``. Tests point ``GITHUB_API_BASE`` and ``GITHUB_RAW_BASE`` at
+``url``.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import tarfile
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from services.docs_source import git_blob_sha
+from services.github_client import CREWAI_BRANCH, CREWAI_REPO, GitHubDocsClient
+from services.memory_cache import MemoryCache
+from services.rate_limiter import RateLimitScheduler
+
+# Top-level directory GitHub puts all tarball members under
+ARCHIVE_PREFIX = "crewAIInc-crewAI-0123456"
+
+
+def make_client(**kwargs) -> GitHubDocsClient:
+    """Client with private caches and rate-limit budget, so tests stay isolated."""
+    kwargs.setdefault("cache_dir", None)
+    kwargs.setdefault("memory_cache", MemoryCache())
+    kwargs.setdefault("scheduler", RateLimitScheduler())
+    return GitHubDocsClient(**kwargs)
+
+
+class GitHubStandIn:
+    """Serves ``files`` the way GitHub would serve a repository with them."""
+
+    def __init__(
+        self,
+        files: Dict[str, str],
+        truncate_trees: bool = False,
+        routes: Optional[Dict[str, Callable[[web.Request], Any]]] = None,
+    ):
+        """
+        Args:
+            files: Repository path -> text content
+            truncate_trees: Answer recursive tree requests with
+                ``truncated: true``, like GitHub does for very large trees
+            routes: Extra GET handlers by route, e.g. to emit rate limits
+        """
+        self.files = dict(files)
+        self.truncate_trees = truncate_trees
+        self.archive_status = 200
+        # Seconds to pause between 64 KB pieces of the tarball, to make the
+        # download slow enough to stop halfway
+        self.archive_chunk_delay = 0.0
+        self.archive_bytes_sent = 0
+        # Path -> content the raw host serves instead of the current one,
+        # like its CDN does for a while after a push
+        self.stale_raw: Dict[str, str] = {}
+        self.requests: List[str] = []
+        self.routes = routes or {}
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "GitHubStandIn":
+        app = web.Application(middlewares=[self._record])
+        for route, handler in self.routes.items():
+            app.router.add_get(route, handler)
+        repo = f"/repos/{CREWAI_REPO}"
+        app.router.add_get(f"{repo}/contents/{{path:.*}}", self._contents)
+        app.router.add_get(f"{repo}/git/trees/{{sha}}", self._tree)
+        app.router.add_get(f"{repo}/git/blobs/{{sha}}", self._blob)
+        app.router.add_get(f"{repo}/tarball/{CREWAI_BRANCH}", self._tarball)
+        app.router.add_get(f"/{CREWAI_REPO}/{CREWAI_BRANCH}/{{path:.*}}", self._raw)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._runner.cleanup()
+
+    def count(self, prefix: str) -> int:
+        """Requests whose path starts with ``prefix``."""
+        return sum(path.startswith(prefix) for path in self.requests)
+
+    @web.middleware
+    async def _record(self, request: web.Request, handler):
+        self.requests.append(request.path)
+        return await handler(request)
+
+    def _children(self, directory: str) -> Dict[str, Optional[str]]:
+        """Names directly under ``directory`` -> file path, or None for directories."""
+        prefix = f"{directory}/" if directory else ""
+        children: Dict[str, Optional[str]] = {}
+        for path in self.files:
+            if path.startswith(prefix):
+                name, _, rest = path[len(prefix):].partition("/")
+                children[name] = None if rest else path
+        return children
+
+    def tree_sha(self, directory: str) -> str:
+        """Stable stand-in for the Git tree SHA of a directory."""
+        prefix = f"{directory}/"
+        listing = "\n".join(
+            f"{path} {git_blob_sha(content.encode())}"
+            for path, content in sorted(self.files.items())
+            if path.startswith(prefix)
+        )
+        return hashlib.sha1(f"{directory}\n{listing}".encode()).hexdigest()
+
+    @staticmethod
+    def _json(request: web.Request, data: Any) -> web.Response:
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def _contents(self, request: web.Request) -> web.Response:
+        directory = request.match_info["path"].strip("/")
+        children = self._children(directory)
+        if not children:
+            return web.json_response({"message": "Not Found"}, status=404)
+        entries = []
+        for name, path in sorted(children.items()):
+            full_path = f"{directory}/{name}" if directory else name
+            if path is None:
+                entries.append(
+                    {"name": name, "path": full_path, "type": "dir", "sha": self.tree_sha(full_path)}
+                )
+            else:
+                data = self.files[path].encode()
+                entries.append(
+                    {
+                        "name": name,
+                        "path": full_path,
+                        "type": "file",
+                        "sha": git_blob_sha(data),
+                        "size": len(data),
+                    }
+                )
+        return self._json(request, entries)
+
+    async def _tree(self, request: web.Request) -> web.Response:
+        sha = request.match_info["sha"]
+        directories = {
+            path.rsplit("/", depth)[0]
+            for path in self.files
+            for depth in range(1, path.count("/") + 1)
+        }
+        directory = next((d for d in directories if self.tree_sha(d) == sha), None)
+        if directory is None or request.query.get("recursive") != "1":
+            return web.json_response({"message": "Not Found"}, status=404)
+
+        prefix = f"{directory}/"
+        entries = []
+        subdirectories = set()
+        for path, content in sorted(self.files.items()):
+            if not path.startswith(prefix):
+                continue
+            relative = path[len(prefix):]
+            parts = relative.split("/")
+            for depth in range(1, len(parts)):
+                subdirectories.add("/".join(parts[:depth]))
+            data = content.encode()
+            entries.append(
+                {"path": relative, "type": "blob", "sha": git_blob_sha(data), "size": len(data)}
+            )
+        for subdirectory in subdirectories:
+            entries.append(
+                {"path": subdirectory, "type": "tree", "sha": self.tree_sha(prefix + subdirectory)}
+            )
+        entries.sort(key=lambda entry: entry["path"])
+        if self.truncate_trees:
+            entries = entries[: len(entries) // 2]
+        return self._json(
+            request, {"sha": sha, "tree": entries, "truncated": self.truncate_trees}
+        )
+
+    async def _blob(self, request: web.Request) -> web.Response:
+        sha = request.match_info["sha"]
+        for content in self.files.values():
+            if git_blob_sha(content.encode()) == sha:
+                if "raw" not in request.headers.get("Accept", ""):
+                    return web.json_response({"message": "Only raw blobs are served"}, status=415)
+                return web.Response(text=content)
+        return web.json_response({"message": "Not Found"}, status=404)
+
+    def archive(self) -> bytes:
+        """The repository as GitHub's gzipped tarball of the branch."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, content in sorted(self.files.items()):
+                data = content.encode()
+                member = tarfile.TarInfo(f"{ARCHIVE_PREFIX}/{path}")
+                member.size = len(data)
+                archive.addfile(member, io.BytesIO(data))
+        return buffer.getvalue()
+
+    async def _tarball(self, request: web.Request) -> web.StreamResponse:
+        if self.archive_status != 200:
+            return web.Response(status=self.archive_status)
+        body = self.archive()
+        response = web.StreamResponse(headers={"Content-Type": "application/x-gzip"})
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunk_size = 64 * 1024
+        try:
+            for start in range(0, len(body), chunk_size):
+                await response.write(body[start : start + chunk_size])
+                self.archive_bytes_sent += len(body[start : start + chunk_size])
+                if self.archive_chunk_delay:
+                    await asyncio.sleep(self.archive_chunk_delay)
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client stopped reading
+            pass
+        return response
+
+    async def _raw(self, request: web.Request) -> web.Response:
+        path = request.match_info["path"]
+        if path not in self.files:
+            return web.Response(status=404, text="404: Not Found")
+        return web.Response(text=self.stale_raw.get(path, self.files[path]))
@@ -0,0 +1,31 @@
+import asyncio
+
+from services.concept_discovery import ConceptDiscoveryService
+from services.local_docs_source import LocalDocsSource
+from services.memory_cache import MemoryCache
+
+
+def make_checkout(root, concepts):
+    directory = root / "docs" / "en" / "concepts"
+    directory.mkdir(parents=True)
+    for name in concepts:
+        (directory / f"{name}.mdx").write_text(f"# {name.title()}\n", encoding="utf-8")
+    return LocalDocsSource(str(root))
+
+
+def test_services_sharing_a_cache_keep_their_own_concepts(tmp_path):
+    cache = MemoryCache()
+    first = ConceptDiscoveryService(make_checkout(tmp_path / "a", ["agents", "tasks"]), cache=cache)
+    second = ConceptDiscoveryService(make_checkout(tmp_path / "b", ["flows"]), cache=cache)
+
+    async def scenario():
+        assert sorted(await first.discover_concepts()) == ["agents", "tasks"]
+        assert sorted(await second.discover_concepts()) == ["flows"]
+
+        # Clearing one service leaves the other's cached map in place
+        (tmp_path / "b" / "docs" / "en" / "concepts" / "crews.mdx").write_text("# Crews\n")
+        first.clear_cache()
+        assert sorted(await second.discover_concepts()) == ["flows"]
+        assert sorted(await first.discover_concepts()) == ["agents", "tasks"]
+
+    asyncio.run(scenario())
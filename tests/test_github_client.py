@@ -0,0 +1,236 @@
+import asyncio
+import os
+import tarfile
+import threading
+from contextlib import aclosing
+from datetime import timedelta
+
+import aiohttp
+import pytest
+
+from services.docs_source import git_blob_sha
+
+from .stand_in import make_client
+
+REPO = "/repos/crewAIInc/crewAI"
+
+FILES = {
+    "docs/en/introduction.mdx": "# Introduction\n",
+    "docs/en/concepts/agents.mdx": "# Agents\n\nAgents act.\n",
+    "docs/en/concepts/tasks.mdx": "# Tasks\n",
+    "docs/en/concepts/memory/short-term.mdx": "# Short-term memory\n",
+    "docs/en/guides/flows/first-flow.mdx": "# Your first flow\n",
+    "docs/en/images/diagram.png": "not markdown",
+    "docs/ko/introduction.mdx": "# 소개\n",
+    "lib/crewai/agent.py": "class Agent: ...\n",
+}
+
+EXPECTED_PATHS = sorted(
+    path for path in FILES if path.startswith("docs/en/") and path.endswith(".mdx")
+)
+
+
+def test_doc_files_from_docs_tree(github):
+    async def scenario():
+        async with github(FILES) as stand_in, make_client() as client:
+            files = await client.get_all_doc_files()
+            docs_sha = stand_in.tree_sha("docs/en")
+            # Only the docs subtree is requested, not the whole branch
+            assert stand_in.count(f"{REPO}/git/trees/{docs_sha}") == 1
+            assert stand_in.count(f"{REPO}/git/trees/main") == 0
+            assert stand_in.count(f"{REPO}/contents/docs/en") == 0
+            return files
+
+    files = asyncio.run(scenario())
+
+    assert [f["path"] for f in files] == EXPECTED_PATHS
+    agents = next(f for f in files if f["path"] == "docs/en/concepts/agents.mdx")
+    content = FILES["docs/en/concepts/agents.mdx"].encode()
+    assert agents == {
+        "name": "agents.mdx",
+        "path": "docs/en/concepts/agents.mdx",
+        "relative_path": "concepts/agents.mdx",
+        "sha": git_blob_sha(content),
+        "size": len(content),
+        "category": "concepts",
+    }
+
+
+def test_truncated_tree_falls_back_to_listings(github):
+    async def scenario():
+        async with github(FILES, truncate_trees=True) as stand_in, make_client() as client:
+            files = await client.get_all_doc_files()
+            assert stand_in.count(f"{REPO}/contents/docs/en") > 0
+            return files
+
+    files = asyncio.run(scenario())
+
+    assert [f["path"] for f in files] == EXPECTED_PATHS
+
+
+def test_tree_and_traversal_agree(github):
+    async def scenario():
+        async with github(FILES), make_client() as client:
+            from_tree = await client.get_all_doc_files()
+            from_listings = await client._traverse_doc_files()
+            return from_tree, from_listings
+
+    from_tree, from_listings = asyncio.run(scenario())
+
+    assert from_tree == from_listings
+    assert from_tree == sorted(from_tree, key=lambda f: f["path"])
+
+
+def test_tree_is_cached_per_docs_revision(github):
+    async def scenario():
+        async with github(FILES) as stand_in, make_client() as client:
+            await client.get_all_doc_files()
+            await client.get_all_doc_files()
+            assert stand_in.count(f"{REPO}/git/trees/") == 1
+
+            stand_in.files["docs/en/concepts/crews.mdx"] = "# Crews\n"
+            files = await client.get_all_doc_files()
+            assert stand_in.count(f"{REPO}/git/trees/") == 2
+            return files
+
+    files = asyncio.run(scenario())
+
+    assert "docs/en/concepts/crews.mdx" in [f["path"] for f in files]
+
+
+def test_archive_yields_docs_with_blob_shas(github):
+    async def scenario():
+        async with github(FILES) as stand_in, make_client() as client:
+            items = [item async for item in client.iter_archive_doc_files()]
+            assert stand_in.count(f"{REPO}/tarball/main") == 1
+            listed = await client.get_all_doc_files()
+            return items, listed
+
+    items, listed = asyncio.run(scenario())
+
+    assert sorted(file_info["path"] for file_info, _ in items) == EXPECTED_PATHS
+    for file_info, content in items:
+        assert content == FILES[file_info["path"]]
+        assert file_info["sha"] == git_blob_sha(content.encode())
+    # Described exactly like the listing, so builds can diff either against an index
+    assert sorted((file_info for file_info, _ in items), key=lambda f: f["path"]) == listed
+
+
+def test_archive_error_status_raises(github):
+    async def scenario():
+        async with github(FILES) as stand_in, make_client() as client:
+            stand_in.archive_status = 502
+            with pytest.raises(RuntimeError, match="HTTP 502"):
+                async for _ in client.iter_archive_doc_files():
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_archive_early_exit_stops_extractor(github, monkeypatch):
+    # Random content keeps the archive at several MB even when gzipped
+    files = {
+        f"docs/en/section{i // 50}/page{i}.mdx": os.urandom(8 * 1024).hex()
+        for i in range(400)
+    }
+    extractor_closed = threading.Event()
+    open_archive = tarfile.open
+
+    class TrackedArchive:
+        """Records when the extractor leaves its ``with`` block."""
+
+        def __init__(self, archive):
+            self.archive = archive
+
+        def __enter__(self):
+            return self.archive.__enter__()
+
+        def __exit__(self, *exc_info):
+            try:
+                return self.archive.__exit__(*exc_info)
+            finally:
+                extractor_closed.set()
+
+    def tracking_open(*args, **kwargs):
+        archive = open_archive(*args, **kwargs)
+        return TrackedArchive(archive) if kwargs.get("mode", "").startswith("r|") else archive
+
+    async def scenario():
+        async with github(files) as stand_in, make_client() as client:
+            stand_in.archive_chunk_delay = 0.01
+            monkeypatch.setattr(tarfile, "open", tracking_open)
+            async with aclosing(client.iter_archive_doc_files()) as items:
+                async for file_info, _ in items:
+                    break
+            assert file_info["path"].startswith("docs/en/section")
+            # Closing the generator waited for the extractor thread to end
+            assert extractor_closed.is_set()
+            # ... without downloading the rest of the archive
+            await asyncio.sleep(0.1)
+            assert stand_in.archive_bytes_sent < len(stand_in.archive()) / 2
+
+    asyncio.run(scenario())
+
+
+def test_not_modified_leaves_disk_entry_alone(github, tmp_path):
+    async def scenario():
+        async with github(FILES) as stand_in:
+            async with make_client(cache_dir=str(tmp_path)) as client:
+                first = await client.list_docs_files("concepts")
+            written = {path: path.read_bytes() for path in (tmp_path / "entries").iterdir()}
+
+            # A restarted client finds the listing on disk and revalidates it
+            async with make_client(cache_dir=str(tmp_path), cache_ttl=timedelta(0)) as client:
+                second = await client.list_docs_files("concepts")
+                assert client.not_modified == 1
+
+            assert stand_in.count(f"{REPO}/contents/docs/en/concepts") == 2
+            assert {path: path.read_bytes() for path in (tmp_path / "entries").iterdir()} == written
+            return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert [entry["name"] for entry in first] == ["agents.mdx", "memory", "tasks.mdx"]
+
+
+def test_cached_copy_is_served_when_github_is_unreachable(github, tmp_path):
+    path = "docs/en/concepts/agents.mdx"
+
+    async def scenario():
+        async with github(FILES):
+            async with make_client(cache_dir=str(tmp_path)) as client:
+                await client.fetch_file_content(path)
+                await client.list_docs_files("concepts")
+
+        # Restarted after the stand-in stopped, with every entry due for revalidation
+        async with make_client(cache_dir=str(tmp_path), cache_ttl=timedelta(0)) as client:
+            content = await client.fetch_file_content(path)
+            listing = await client.list_docs_files("concepts")
+            # Nothing cached, nothing to fall back to
+            with pytest.raises(aiohttp.ClientError):
+                await client.list_docs_files("guides")
+        return content, listing
+
+    content, listing = asyncio.run(scenario())
+
+    assert content == FILES[path]
+    assert [entry["name"] for entry in listing] == ["agents.mdx", "memory", "tasks.mdx"]
+
+
+def test_stale_raw_body_is_replaced_by_blob(github):
+    path = "docs/en/concepts/agents.mdx"
+    current = FILES[path]
+    current_sha = git_blob_sha(current.encode())
+
+    async def scenario():
+        async with github(FILES) as stand_in, make_client() as client:
+            stand_in.stale_raw[path] = "# Agents\n\nBefore the push.\n"
+            first = await client.fetch_file_content(path, sha=current_sha)
+            second = await client.fetch_file_content(path, sha=current_sha)
+            assert stand_in.count(f"{REPO}/git/blobs/{current_sha}") == 1
+            return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == current
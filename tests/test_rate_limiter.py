@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from services.rate_limiter import BACKGROUND, RateLimitScheduler, request_priority
+
+from .stand_in import make_client
+
+RAW = "/crewAIInc/crewAI/main"
+
+
+def test_rate_limited_request_is_retried_after_delay(github):
+    attempts = []
+
+    async def limited_once(request):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return web.Response(text="# Agents\n")
+
+    async def scenario():
+        routes = {f"{RAW}/docs/en/agents.mdx": limited_once}
+        scheduler = RateLimitScheduler()
+        async with github({}, routes=routes), make_client(scheduler=scheduler) as client:
+            content = await client.fetch_file_content("docs/en/agents.mdx")
+        return content, scheduler
+
+    content, scheduler = asyncio.run(scenario())
+
+    assert content == "# Agents\n"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.3
+    assert scheduler.rate_limited == 1
+    assert scheduler.retries == 1
+
+
+def test_background_requests_pause_at_reserve(github):
+    reset_at = time.time() + 0.6
+
+    async def budgeted(request):
+        # Two requests left until the window resets, then a fresh budget
+        remaining, reset = (2, reset_at) if time.time() < reset_at else (59, reset_at + 3600)
+        headers = {
+            "X-RateLimit-Limit": "60",
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+        return web.Response(text=request.path, headers=headers)
+
+    async def fetch(client, path, priority=None):
+        if priority is not None:
+            request_priority.set(priority)
+        await client.fetch_file_content(path)
+        return time.time()
+
+    async def scenario():
+        routes = {f"{RAW}/docs/en/{{name}}": budgeted}
+        scheduler = RateLimitScheduler(background_reserve=2)
+        async with github({}, routes=routes), make_client(scheduler=scheduler) as client:
+            # Learn the budget: two requests left, which is the reserve
+            await fetch(client, "docs/en/first.mdx")
+            background = asyncio.create_task(fetch(client, "docs/en/build.mdx", BACKGROUND))
+            await asyncio.sleep(0.1)
+            assert not background.done()
+            interactive_done = await fetch(client, "docs/en/tool.mdx")
+            background_done = await background
+        return interactive_done, background_done, scheduler
+
+    interactive_done, background_done, scheduler = asyncio.run(scenario())
+
+    assert interactive_done < reset_at
+    assert background_done >= reset_at
+    assert scheduler.waits > 0
+
+
+def test_long_retry_after_returns_rejection(github):
+    attempts = []
+
+    async def limited(request):
+        attempts.append(request.path)
+        return web.Response(status=429, headers={"Retry-After": "30"})
+
+    async def scenario():
+        routes = {f"{RAW}/docs/en/agents.mdx": limited}
+        scheduler = RateLimitScheduler(max_retry_wait=1.0)
+        async with github({}, routes=routes), make_client(scheduler=scheduler) as client:
+            started = time.monotonic()
+            content = await client.fetch_file_content("docs/en/agents.mdx")
+            elapsed = time.monotonic() - started
+        return content, elapsed, scheduler
+
+    content, elapsed, scheduler = asyncio.run(scenario())
+
+    assert content is None
+    assert len(attempts) == 1
+    assert elapsed < 1.0
+    assert scheduler.rate_limited == 1
+    assert scheduler.retries == 0
+    # Later requests to the host still wait for the server's delay
+    (host,) = scheduler.stats()["hosts"].values()
+    assert host["blocked_for"] > 25
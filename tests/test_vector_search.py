@@ -0,0 +1,219 @@
+import asyncio
+
+import pytest
+
+from services.embedding_providers import LocalEmbeddingProvider
+from services.local_docs_source import LocalDocsSource
+from services.vector_search import VectorSearch
+
+DOCS = {
+    "introduction.mdx": """---
+title: Introduction
+---
+# Introduction
+
+CrewAI orchestrates role-playing autonomous AI agents.
+""",
+    "concepts/agents.mdx": """---
+title: Agents
+---
+# Agents
+
+An agent is an autonomous unit with a role, a goal and a backstory.
+
+## Delegation
+
+Set `allow_delegation` to let an agent hand work to its coworkers.
+
+```python
+agent = Agent(role="Researcher", allow_delegation=True)
+```
+""",
+    "concepts/tasks.mdx": """---
+title: Tasks
+---
+# Tasks
+
+A task is a specific assignment with an expected output.
+
+## Guardrails
+
+Task guardrails validate the output before it is passed on.
+""",
+    "guides/flows/first-flow.mdx": """---
+title: Your first flow
+---
+# Your first flow
+
+Flows chain crews and plain Python steps with state.
+
+## Routers
+
+Use the router decorator to branch a flow on its state.
+""",
+}
+
+
+def write_docs(root, docs):
+    for path, content in docs.items():
+        file = root / "docs" / "en" / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content, encoding="utf-8")
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    root = tmp_path / "crewAI"
+    write_docs(root, DOCS)
+    return root
+
+
+def make_search(tmp_path, source):
+    data_dir = tmp_path / "vector_data"
+    data_dir.mkdir(exist_ok=True)
+    return VectorSearch(
+        str(data_dir),
+        embedding_provider=LocalEmbeddingProvider(),
+        docs_source=source,
+        poll_interval=None,
+        persist_query_cache=False,
+    )
+
+
+async def build(search):
+    await search.initialize()
+    if search._indexing_task is not None:
+        await search._indexing_task
+
+
+def paths(response):
+    return [result["path"] for result in response["results"]]
+
+
+def test_build_indexes_every_document(tmp_path, checkout):
+    async def scenario():
+        search = make_search(tmp_path, LocalDocsSource(str(checkout)))
+        await build(search)
+        return search
+
+    search = asyncio.run(scenario())
+
+    status = search.get_status()
+    assert status["status"] == "ready"
+    assert status["total_docs"] == len(DOCS)
+    assert status["revision"] is not None
+    manifest = search._snapshot.manifest
+    assert sorted(manifest["files"]) == sorted(DOCS)
+    assert search.generations.current_id() == search._snapshot.generation
+
+
+def test_search_modes(tmp_path, checkout):
+    async def scenario():
+        search = make_search(tmp_path, LocalDocsSource(str(checkout)))
+        await build(search)
+        return (
+            await search.search("allow_delegation"),
+            await search.search("autonomous agent role goal backstory", mode="semantic"),
+            await search.search("task guardrails validate output", mode="hybrid"),
+            await search.search("router decorator", mode="lexical"),
+        )
+
+    identifier, semantic, hybrid, lexical = asyncio.run(scenario())
+
+    # Identifier-like queries are answered lexically without an embedding
+    assert identifier["mode"] == "lexical"
+    assert paths(identifier)[0] == "concepts/agents.mdx"
+    assert semantic["mode"] == "semantic"
+    assert paths(semantic)[0] == "concepts/agents.mdx"
+    assert hybrid["mode"] == "hybrid"
+    assert paths(hybrid)[0] == "concepts/tasks.mdx"
+    assert paths(lexical)[0] == "guides/flows/first-flow.mdx"
+
+
+def test_filtered_search(tmp_path, checkout):
+    async def scenario():
+        search = make_search(tmp_path, LocalDocsSource(str(checkout)))
+        await build(search)
+        return (
+            await search.search("agents tasks flows", category="concepts"),
+            await search.search("agents tasks flows", path_prefix="guides/"),
+            await search.search("agent", has_code_blocks=True),
+            await search.search_many(["agent", "flow"], category="guides"),
+        )
+
+    by_category, by_prefix, with_code, batch = asyncio.run(scenario())
+
+    assert paths(by_category)
+    assert {result["category"] for result in by_category["results"]} == {"concepts"}
+    assert paths(by_prefix)
+    assert all(path.startswith("guides/") for path in paths(by_prefix))
+    assert paths(with_code)
+    assert all(result["has_code_blocks"] for result in with_code["results"])
+    for response in batch["results"]:
+        assert all(path.startswith("guides/") for path in paths(response))
+
+
+def test_incremental_rebuild(tmp_path, checkout):
+    async def scenario():
+        search = make_search(tmp_path, LocalDocsSource(str(checkout)))
+        await build(search)
+        first = search._snapshot
+        embedded_before = search.embedding_store.added
+
+        (checkout / "docs" / "en" / "concepts" / "tasks.mdx").unlink()
+        write_docs(
+            checkout,
+            {
+                "concepts/agents.mdx": DOCS["concepts/agents.mdx"]
+                + "\n## Memory\n\nAgents remember earlier kickoffs with memory.\n"
+            },
+        )
+        assert await search._should_rebuild()
+        await search.start_background_indexing()
+        await search._indexing_task
+
+        response = await search.search("remember earlier kickoffs", mode="lexical")
+        return search, first, embedded_before, response
+
+    search, first, embedded_before, response = asyncio.run(scenario())
+
+    second = search._snapshot
+    assert second.generation != first.generation
+    assert "concepts/tasks.mdx" not in second.manifest["files"]
+    assert "concepts/tasks.mdx" not in set(second.df["path"])
+    # Unchanged files keep their rows; only the new section is embedded
+    assert second.manifest["files"]["introduction.mdx"] == first.manifest["files"]["introduction.mdx"]
+    assert search.embedding_store.added - embedded_before == 1
+    assert paths(response)[0] == "concepts/agents.mdx"
+    assert second.manifest["revision"] != first.manifest["revision"]
+
+
+def test_failed_files_are_retried(tmp_path, checkout):
+    class FlakySource(LocalDocsSource):
+        """Fails the first fetch of the tasks page."""
+
+        failures = {"docs/en/concepts/tasks.mdx"}
+
+        async def fetch_file_content(self, path, sha=None):
+            if path in self.failures:
+                self.failures.discard(path)
+                return None
+            return await super().fetch_file_content(path, sha=sha)
+
+    async def scenario():
+        search = make_search(tmp_path, FlakySource(str(checkout)))
+        await build(search)
+        first = search._snapshot
+        assert "concepts/tasks.mdx" not in first.manifest["files"]
+        # Nothing changed upstream, but the failed file is still missing
+        assert await search._should_rebuild()
+        await search.start_background_indexing()
+        await search._indexing_task
+        return first, search._snapshot
+
+    first, second = asyncio.run(scenario())
+
+    assert first.manifest["revision"] is None
+    assert "concepts/tasks.mdx" in second.manifest["files"]
+    assert "concepts/tasks.mdx" in set(second.df["path"])
+    assert second.manifest["revision"] is not None